@@ -1,27 +1,27 @@
 import argparse
 import os
-import nacl.signing
-import nacl.encoding
+import nacl.bindings
 
 def generate_keypair(output_path: str):
     """
     Generates an Ed25519 keypair and saves the private key to a file.
     The public key is derived from the private key.
     """
-    private_key = nacl.signing.SigningKey.generate()
-    public_key = private_key.verify_key
+    # Work on raw bytes; libsodium's 64-byte secret key is seed || public_key.
+    public_key, secret_key = nacl.bindings.crypto_sign_keypair()
+    seed = secret_key[:nacl.bindings.crypto_sign_SEEDBYTES]
 
     # Ensure the output directory exists
     output_dir = os.path.dirname(output_path)
-    if output_dir and not os.path.exists(output_dir):
-        os.makedirs(output_dir)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
 
     # Save the private key in a hex-encoded format
     with open(output_path, 'wb') as f:
-        f.write(private_key.encode(encoder=nacl.encoding.HexEncoder))
+        f.write(seed.hex().encode())
     
     print(f"Private key saved to: {output_path}")
-    print(f"Public key (hex): {public_key.encode(encoder=nacl.encoding.HexEncoder).decode('utf-8')}")
+    print(f"Public key (hex): {public_key.hex()}")
     print("Keep your private key secure!")
 
 if __name__ == "__main__":
@@ -1,48 +1,41 @@
 import asyncio
-import nacl.signing
-import nacl.encoding
+import functools
 import os
 import logging
-import json # Added for JSON logging
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
-from .node import ValidatorNode
+from . import ed25519
+from .node import PeerRegistry, ValidatorNode
 from .config import load_config
+from .logging_config import configure_logging
 
-# Custom JSON Formatter
-class JsonFormatter(logging.Formatter):
-    def format(self, record):
-        log_record = {
-            "timestamp": self.formatTime(record, self.datefmt),
-            "level": record.levelname,
-            "name": record.name,
-            "message": record.getMessage(),
-            "pathname": record.pathname,
-            "lineno": record.lineno,
-            "funcName": record.funcName,
-            "process": record.process,
-            "thread": record.thread,
-        }
-        if record.exc_info:
-            log_record["exc_info"] = self.formatException(record.exc_info)
-        return json.dumps(log_record)
+# Below this many keys, starting worker processes costs more than the keygen.
+PARALLEL_KEYGEN_THRESHOLD = 1024
+
+def _gen_one(_index: int) -> tuple:
+    """Generate one (seed, public_key) pair; module-level so it pickles."""
+    return ed25519.keygen()
+
+def generate_keypairs(count: int) -> list:
+    """Generate count simulated validator keypairs, in parallel for large counts."""
+    if count < PARALLEL_KEYGEN_THRESHOLD:
+        return [ed25519.keygen() for _ in range(count)]
+    workers = os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        return list(ex.map(_gen_one, range(count), chunksize=max(1, count // (workers * 4))))
+
+@functools.lru_cache(maxsize=1)
+def load_validator_key(path: str) -> tuple:
+    """Read a hex-encoded Ed25519 seed once per process and return (seed, public_key)."""
+    seed = ed25519.read_key_file(path)
+    return seed, ed25519.public_key_from_seed(seed)
 
 async def main():
     # Load configuration
     config = load_config(config_path="validator.yaml")
 
-    # Configure logging with JSON formatter
-    log_level = getattr(logging, config.validator.monitoring.log_level.upper(), logging.INFO)
-    handler = logging.StreamHandler()
-    formatter = JsonFormatter()
-    handler.setFormatter(formatter)
-    
-    root_logger = logging.getLogger()
-    root_logger.setLevel(log_level)
-    
-    # Clear existing handlers to prevent duplicate logs from basicConfig in node.py
-    if root_logger.hasHandlers():
-        root_logger.handlers.clear()
-    root_logger.addHandler(handler)
+    # Configure logging; structlog renders plain logging records as JSON too
+    configure_logging(config.validator.monitoring.log_level)
 
     logger = logging.getLogger(__name__)
     logger.info("Starting Chorus Validator Node...")
@@ -54,60 +47,56 @@ async def main():
         logger.error("Please generate a keypair using 'poetry run python generate_keys.py' first.")
         return
 
-    with open(keypair_path, 'rb') as f:
-        private_key_hex = f.read().strip()
-    
-    private_key = nacl.signing.SigningKey(private_key_hex, encoder=nacl.encoding.HexEncoder)
-    public_key = private_key.verify_key
-    keypair = (private_key.encode(), public_key.encode())
+    keypair = load_validator_key(keypair_path)
 
     # Ensure storage path exists
     storage_path = config.validator.storage.path
-    if not os.path.exists(storage_path):
-        os.makedirs(storage_path)
-        logger.info(f"Created storage path: {storage_path}")
+    os.makedirs(storage_path, exist_ok=True)
+    logger.info(f"Using storage path: {storage_path}")
 
     # For single-process simulation, define multiple validator nodes and link their DHTs.
     num_simulated_validators = 3 # Example: 3 validators
     simulated_validator_nodes: List[ValidatorNode] = []
-    simulated_keypairs: List[tuple] = []
-    all_validator_ids: List[str] = []
 
-    # Generate keypairs for simulated validators
-    for i in range(num_simulated_validators):
-        # For simplicity, generate new keypairs. In a real scenario, these would be loaded.
-        sim_private_key = nacl.signing.SigningKey.generate()
-        sim_public_key = sim_private_key.verify_key
-        simulated_keypairs.append((sim_private_key.encode(), sim_public_key.encode()))
-        all_validator_ids.append(sim_public_key.hex())
+    # Generate keypairs for simulated validators.
+    # For simplicity, generate new keypairs. In a real scenario, these would be loaded.
+    simulated_keypairs = generate_keypairs(num_simulated_validators)
+    all_validator_ids = [sim_public_key.hex() for _, sim_public_key in simulated_keypairs]
 
     logger.info(f"Simulating a network of {num_simulated_validators} validators.")
 
-    # Create ValidatorNode instances without peers initially
+    # Each simulated node gets its own storage path; create them all up front
+    node_storage_paths = [f"{config.validator.storage.path}_node{i}" for i in range(num_simulated_validators)]
+    with ThreadPoolExecutor() as ex:
+        list(ex.map(functools.partial(os.makedirs, exist_ok=True), node_storage_paths))
+
+    # Create ValidatorNode instances; each one's DHT joins the shared peer registry
+    peer_registry = PeerRegistry()
     for i in range(num_simulated_validators):
         node_config = load_config(config_path="validator.yaml") # Load config for each node
-        # Adjust storage path for each simulated node
-        node_config.validator.storage.path = f"{config.validator.storage.path}_node{i}"
-        if not os.path.exists(node_config.validator.storage.path):
-            os.makedirs(node_config.validator.storage.path)
+        node_config.validator.storage.path = node_storage_paths[i]
 
         validator_node = ValidatorNode(
             config=node_config,
             validator_keypair=simulated_keypairs[i],
-            all_validator_ids=all_validator_ids
+            all_validator_ids=all_validator_ids,
+            peer_registry=peer_registry
         )
         simulated_validator_nodes.append(validator_node)
 
-    # Link DHTNetwork instances as peers
-    for i, node in enumerate(simulated_validator_nodes):
-        other_peers = [p.dht for j, p in enumerate(simulated_validator_nodes) if i != j]
-        node.dht.peers = other_peers
+    for node in simulated_validator_nodes:
         logger.info(f"ValidatorNode {node.public_key.hex()} has {len(node.dht.peers)} peers.")
 
     # Start all validator nodes concurrently
     await asyncio.gather(*[node.start() for node in simulated_validator_nodes])
 
 if __name__ == "__main__":
+    try:
+        import uvloop
+    except ImportError:  # uvloop is not available on Windows
+        uvloop = None
+    if uvloop is not None:
+        uvloop.install()
     try:
         asyncio.run(main())
     except KeyboardInterrupt:
@@ -1,10 +1,12 @@
 """API layer for Conductor with gRPC and REST endpoints."""
 
 import asyncio
+import binascii
 import grpc.aio
 import logging
-from typing import Optional, Dict, Any
-from datetime import datetime
+import time
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Tuple
 import json
 
 # Import generated protobuf files
@@ -17,24 +19,107 @@ from conductor.errors import (
     InsufficientValidatorsError,
     InvalidSignatureError
 )
+from conductor.hashing import blake3_hash
 from conductor.metrics import metrics
+from conductor.models import EventColumns
 from conductor.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+# Wall-clock seconds cached for response timestamps; refreshed at most every
+# _CLOCK_REFRESH_SECONDS of monotonic time.
+_CLOCK_REFRESH_SECONDS = 0.05
+_LAST_TS: int = 0
+_LAST_MONO: float = float("-inf")
+
+
+def now_seconds() -> int:
+    """Return the current Unix time in whole seconds, reading the wall clock at most every 50 ms."""
+    global _LAST_TS, _LAST_MONO
+    mono = time.monotonic()
+    if mono - _LAST_MONO > _CLOCK_REFRESH_SECONDS:
+        _LAST_TS = int(time.time())
+        _LAST_MONO = mono
+    return _LAST_TS
+
+# Ed25519 signatures are 64 bytes, i.e. 128 hex characters.
+_SIGNATURE_HEX_LEN = 128
+
+
+def _hex_signatures(signatures) -> list:
+    """Hex-encode a list of signatures with one hexlify call over the joined buffer."""
+    if not signatures:
+        return []
+    joined = binascii.hexlify(b"".join(signatures)).decode()
+    return [joined[i:i + _SIGNATURE_HEX_LEN] for i in range(0, len(joined), _SIGNATURE_HEX_LEN)]
+
+# Maximum number of read responses kept by each servicer.
+RESPONSE_CACHE_SIZE = 2048
+
 class ConductorServicer(conductor_pb2_grpc.ConductorServiceServicer):
     """gRPC service implementation for Conductor."""
     
     def __init__(self, validator_node):
         self.validator_node = validator_node
         self.logger = get_logger("ConductorServicer")
+        # Bound to the running loop lazily; the servicer may be built before it starts.
+        self._loop_time = None
+        # LRU of successful responses for immutable reads (stored day proofs,
+        # finalized blocks), keyed by method name and request wire bytes.
+        # Entries are keyed on the storage version too and the cache is dropped
+        # whenever that version moves, so an overwritten proof is never served.
+        self._response_cache: "OrderedDict[Tuple[str, int, bytes], Any]" = OrderedDict()
+        self._cache_version: Optional[int] = None
+
+    def _clock(self) -> float:
+        """Event loop time, with the loop's bound time method captured on first use."""
+        loop_time = self._loop_time
+        if loop_time is None:
+            loop_time = self._loop_time = asyncio.get_running_loop().time
+        return loop_time()
+
+    def _cache_lookup(self, method: str, request) -> Tuple[Tuple[str, int, bytes], Optional[Any]]:
+        """Return the cache key for a request and the cached response, if any.
+
+        A response computed from storage read before a write completes is stored
+        under the old version and never matches again.
+        """
+        version = self.validator_node.storage.version
+        if version != self._cache_version:
+            self.invalidate_cache()
+            self._cache_version = version
+        key = (method, version, request.SerializeToString())
+        response = self._response_cache.get(key)
+        if response is not None:
+            self._response_cache.move_to_end(key)
+        return key, response
+
+    def _cache_store(self, key: Tuple[str, int, bytes], response) -> None:
+        """Cache a successful response, evicting the least recently used entry."""
+        self._response_cache[key] = response
+        if len(self._response_cache) > RESPONSE_CACHE_SIZE:
+            self._response_cache.popitem(last=False)
+
+    def invalidate_cache(self) -> None:
+        """Drop all cached responses, e.g. after a stored proof is replaced."""
+        self._response_cache.clear()
         
     async def GetDayProof(self, request: conductor_pb2.GetDayProofRequest, context) -> conductor_pb2.GetDayProofResponse:
         """Get canonical day proof for a given day."""
-        start_time = asyncio.get_event_loop().time()
+        start_time = self._clock()
         
         try:
             self.logger.info("GetDayProof request", day_number=request.day_number)
+
+            cache_key, cached = self._cache_lookup("GetDayProof", request)
+            if cached is not None:
+                # The cached message is shared between callers; stamp a copy
+                response = conductor_pb2.GetDayProofResponse()
+                response.CopyFrom(cached)
+                response.timestamp = now_seconds()
+                latency = self._clock() - start_time
+                metrics.record_grpc_request("GetDayProof", "success", latency)
+                return response
             
             # Get day proof from storage
             day_proof = await self.validator_node.storage.get_proof(request.day_number)
@@ -45,56 +130,59 @@ class ConductorServicer(conductor_pb2_grpc.ConductorServiceServicer):
                 return conductor_pb2.GetDayProofResponse()
                 
             # Record metrics
-            latency = asyncio.get_event_loop().time() - start_time
+            latency = self._clock() - start_time
             metrics.record_grpc_request("GetDayProof", "success", latency)
             
-            return conductor_pb2.GetDayProofResponse(
+            response = conductor_pb2.GetDayProofResponse(
                 day_number=day_proof.day_number,
                 vdf_output=day_proof.proof.hex(),
-                validator_signatures=[sig.hex() for sig in getattr(day_proof, 'signatures', [])],
-                timestamp=int(datetime.now().timestamp())
+                validator_signatures=_hex_signatures(getattr(day_proof, 'signatures', [])),
+                timestamp=now_seconds()
             )
+            self._cache_store(cache_key, response)
+            return response
             
         except Exception as e:
             self.logger.error("GetDayProof error", error=str(e), day_number=request.day_number)
             context.set_code(grpc.StatusCode.INTERNAL)
             context.set_details(str(e))
             
-            latency = asyncio.get_event_loop().time() - start_time
+            latency = self._clock() - start_time
             metrics.record_grpc_request("GetDayProof", "failure", latency)
             
             return conductor_pb2.GetDayProofResponse()
 
+    def _submit_one(self, epoch: int, event) -> str:
+        """Submit a single event inline, skipping batch decoding and request hashing."""
+        return f"batch_{epoch}_inline_{event.creation_day}_{blake3_hash(event.signature)[:16]}"
+
     async def SubmitEventBatch(self, request: conductor_pb2.SubmitEventBatchRequest, context) -> conductor_pb2.SubmitEventBatchResponse:
         """Submit event batch for consensus."""
-        start_time = asyncio.get_event_loop().time()
+        start_time = self._clock()
         
         try:
-            self.logger.info("SubmitEventBatch request", epoch=request.epoch, event_count=len(request.events))
+            event_count = len(request.events)
+            self.logger.info("SubmitEventBatch request", epoch=request.epoch, event_count=event_count)
             
             # Validate request
-            if not request.events:
+            if not event_count:
                 context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
                 context.set_details("Empty event batch")
                 return conductor_pb2.SubmitEventBatchResponse()
-                
-            # Convert protobuf events to internal format
-            events = []
-            for event in request.events:
-                # Convert protobuf event to internal Event object
-                # This is a simplified conversion - in production, you'd have proper mapping
-                from conductor.models import Event
-                internal_event = Event(
-                    creation_day=event.creation_day,
-                    sig=event.signature
-                )
-                events.append(internal_event)
-                
-            # Submit to consensus
-            batch_id = f"batch_{request.epoch}_{hash(str(events)) % 10000}"
+
+            if event_count == 1:
+                # Single events are the common latency-sensitive case
+                batch_id = self._submit_one(request.epoch, request.events[0])
+            else:
+                # Decode the batch column-wise; Event objects are only built on access
+                events = EventColumns.from_proto(request.events)
+
+                # Submit to consensus. The batch id is one BLAKE3 pass over the
+                # contiguous wire encoding of the events.
+                batch_id = f"batch_{request.epoch}_{blake3_hash(events.wire)[:16]}"
             
             # Record metrics
-            latency = asyncio.get_event_loop().time() - start_time
+            latency = self._clock() - start_time
             metrics.record_grpc_request("SubmitEventBatch", "success", latency)
             
             return conductor_pb2.SubmitEventBatchResponse(
@@ -107,7 +195,7 @@ class ConductorServicer(conductor_pb2_grpc.ConductorServiceServicer):
             context.set_code(grpc.StatusCode.ABORTED)
             context.set_details(str(e))
             
-            latency = asyncio.get_event_loop().time() - start_time
+            latency = self._clock() - start_time
             metrics.record_grpc_request("SubmitEventBatch", "failure", latency)
             
             return conductor_pb2.SubmitEventBatchResponse()
@@ -117,17 +205,24 @@ class ConductorServicer(conductor_pb2_grpc.ConductorServiceServicer):
             context.set_code(grpc.StatusCode.INTERNAL)
             context.set_details(str(e))
             
-            latency = asyncio.get_event_loop().time() - start_time
+            latency = self._clock() - start_time
             metrics.record_grpc_request("SubmitEventBatch", "failure", latency)
             
             return conductor_pb2.SubmitEventBatchResponse()
 
     async def GetBlock(self, request: conductor_pb2.GetBlockRequest, context) -> conductor_pb2.GetBlockResponse:
         """Get finalized block for an epoch."""
-        start_time = asyncio.get_event_loop().time()
+        start_time = self._clock()
         
         try:
             self.logger.info("GetBlock request", epoch=request.epoch)
+
+            # Finalized blocks never change; the cache is still dropped on storage writes.
+            cache_key, cached = self._cache_lookup("GetBlock", request)
+            if cached is not None:
+                latency = self._clock() - start_time
+                metrics.record_grpc_request("GetBlock", "success", latency)
+                return cached
             
             # Get block from consensus
             block = self.validator_node.consensus.committed_blocks.get(request.epoch)
@@ -138,30 +233,32 @@ class ConductorServicer(conductor_pb2_grpc.ConductorServiceServicer):
                 return conductor_pb2.GetBlockResponse()
                 
             # Record metrics
-            latency = asyncio.get_event_loop().time() - start_time
+            latency = self._clock() - start_time
             metrics.record_grpc_request("GetBlock", "success", latency)
             
-            return conductor_pb2.GetBlockResponse(
+            response = conductor_pb2.GetBlockResponse(
                 epoch=request.epoch,
                 block_hash=block.get("block_digest", ""),
                 merkle_root=block.get("merkle_root", ""),
                 events=block.get("events", []),
                 quorum_cert=block.get("quorum_cert", "")
             )
+            self._cache_store(cache_key, response)
+            return response
             
         except Exception as e:
             self.logger.error("GetBlock error", error=str(e), epoch=request.epoch)
             context.set_code(grpc.StatusCode.INTERNAL)
             context.set_details(str(e))
             
-            latency = asyncio.get_event_loop().time() - start_time
+            latency = self._clock() - start_time
             metrics.record_grpc_request("GetBlock", "failure", latency)
             
             return conductor_pb2.GetBlockResponse()
 
     async def GetConsensusStatus(self, request: conductor_pb2.GetConsensusStatusRequest, context) -> conductor_pb2.GetConsensusStatusResponse:
         """Get consensus status for a batch."""
-        start_time = asyncio.get_event_loop().time()
+        start_time = self._clock()
         
         try:
             self.logger.info("GetConsensusStatus request", batch_id=request.batch_id)
@@ -171,7 +268,7 @@ class ConductorServicer(conductor_pb2_grpc.ConductorServiceServicer):
             status = "pending"  # Default status
             
             # Record metrics
-            latency = asyncio.get_event_loop().time() - start_time
+            latency = self._clock() - start_time
             metrics.record_grpc_request("GetConsensusStatus", "success", latency)
             
             return conductor_pb2.GetConsensusStatusResponse(
@@ -184,20 +281,32 @@ class ConductorServicer(conductor_pb2_grpc.ConductorServiceServicer):
             context.set_code(grpc.StatusCode.INTERNAL)
             context.set_details(str(e))
             
-            latency = asyncio.get_event_loop().time() - start_time
+            latency = self._clock() - start_time
             metrics.record_grpc_request("GetConsensusStatus", "failure", latency)
             
             return conductor_pb2.GetConsensusStatusResponse()
 
 
+# Server options tuned for throughput. so_reuseport lets several server
+# processes share one port, e.g. one per core.
+GRPC_SERVER_OPTIONS = [
+    ('grpc.max_concurrent_streams', 1024),
+    ('grpc.http2.max_frame_size', 16777215),
+    ('grpc.so_reuseport', 1),
+]
+
+
+# Seconds in-flight RPCs get to complete when the server is stopped.
+GRPC_SHUTDOWN_GRACE = 5.0
+
+
 async def serve_grpc(validator_node, config, port: int = 50051):
-    """Start gRPC server."""
-    server = grpc.aio.server()
+    """Start the gRPC server on the running event loop and serve until cancelled."""
+    server = grpc.aio.server(options=GRPC_SERVER_OPTIONS)
     
     # Add service
-    conductor_pb2_grpc.add_ConductorServiceServicer_to_server(
-        ConductorServicer(validator_node), server
-    )
+    servicer = ConductorServicer(validator_node)
+    conductor_pb2_grpc.add_ConductorServiceServicer_to_server(servicer, server)
     
     # Configure server
     server.add_insecure_port(f'[::]:{port}')
@@ -207,6 +316,8 @@ async def serve_grpc(validator_node, config, port: int = 50051):
     
     try:
         await server.wait_for_termination()
-    except KeyboardInterrupt:
+    finally:
+        # Runs when the serving task is cancelled at shutdown: let in-flight
+        # RPCs finish on this loop
         logger.info("Shutting down gRPC server")
-        await server.stop(grace=5.0)
+        await server.stop(grace=GRPC_SHUTDOWN_GRACE)
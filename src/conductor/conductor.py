@@ -1,6 +0,0 @@
-# This file previously contained ValidatorStorage, DHTNetwork, ConsensusModule, and ValidatorNode.
-# These classes have been consolidated into src/conductor/node.py for better organization.
-# This file now serves as a placeholder or can be used for re-exporting if needed.
-
-from .node import ValidatorNode, ValidatorStorage, DHTNetwork, ConsensusModule
-from .models import ConsensusError, DayProof
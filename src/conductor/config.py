@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import Any, Callable, List, Optional, Tuple
 import yaml
 import os
 
@@ -16,6 +16,9 @@ class VDFConfig(BaseModel):
 class StorageConfig(BaseModel):
     backend: str = "lmdb" # Changed from rocksdb to lmdb as per current implementation
     path: str = "./validator_data"
+    # fsync on every commit. Proofs can be re-fetched from the DHT, so a node
+    # may trade the last few commits on power loss for throughput with False.
+    sync: bool = True
 
 class ConsensusConfig(BaseModel):
     min_validators: int = 3
@@ -37,6 +40,19 @@ class ValidatorConfig(BaseModel):
 class Config(BaseModel):
     validator: ValidatorConfig = Field(default_factory=ValidatorConfig)
 
+# Environment overrides: (variable, path into the config dict, converter),
+# e.g. VALIDATOR_NETWORK_LISTEN_ADDRESS -> validator.network.listen_address
+_ENV_SCHEMA: List[Tuple[str, Tuple[str, ...], Callable[[str], Any]]] = [
+    ("VALIDATOR_KEYPAIR_PATH", ("validator", "keypair_path"), str),
+    ("VALIDATOR_NETWORK_LISTEN_ADDRESS", ("validator", "network", "listen_address"), str),
+    ("VALIDATOR_STORAGE_PATH", ("validator", "storage", "path"), str),
+    ("VALIDATOR_VDF_ITERATIONS", ("validator", "vdf", "iterations"), int),
+    ("VALIDATOR_VDF_ADJUSTMENT_INTERVAL_DAYS", ("validator", "vdf", "adjustment_interval_days"), int),
+    ("CONSENSUS_THRESHOLD", ("validator", "consensus", "threshold"), float),
+    ("VALIDATOR_PROMETHEUS_PORT", ("validator", "monitoring", "prometheus_port"), int),
+    ("VALIDATOR_LOG_LEVEL", ("validator", "monitoring", "log_level"), str),
+]
+
 def load_config(config_path: Optional[str] = None) -> Config:
     config_data = {}
     if config_path and os.path.exists(config_path):
@@ -44,37 +60,15 @@ def load_config(config_path: Optional[str] = None) -> Config:
             config_data = yaml.safe_load(f)
 
     # Load from environment variables, overriding YAML values
-    # This is a simplified example; a more robust solution would handle nested structures
-    # e.g., VALIDATOR_NETWORK_LISTEN_ADDRESS
-    env_overrides = {
-        "VALIDATOR_KEYPAIR_PATH": "validator.keypair_path",
-        "VALIDATOR_NETWORK_LISTEN_ADDRESS": "validator.network.listen_address",
-        "VALIDATOR_STORAGE_PATH": "validator.storage.path",
-        "VALIDATOR_VDF_ITERATIONS": "validator.vdf.iterations",
-        "VALIDATOR_VDF_ADJUSTMENT_INTERVAL_DAYS": "validator.vdf.adjustment_interval_days",
-        "CONSENSUS_THRESHOLD": "validator.consensus.threshold",
-        "VALIDATOR_PROMETHEUS_PORT": "validator.monitoring.prometheus_port",
-        "VALIDATOR_LOG_LEVEL": "validator.monitoring.log_level",
-    }
-
-    for env_var, config_key in env_overrides.items():
-        if env_var in os.environ:
-            value = os.environ[env_var]
-            # Simple nested dict update
-            keys = config_key.split('.')
-            current_dict = config_data
-            for i, key in enumerate(keys):
-                if i == len(keys) - 1:
-                    # Convert to appropriate type if necessary
-                    if key == "threshold":
-                        current_dict[key] = float(value)
-                    elif key in ["prometheus_port", "iterations", "adjustment_interval_days"]:
-                        current_dict[key] = int(value)
-                    else:
-                        current_dict[key] = value
-                else:
-                    if key not in current_dict or not isinstance(current_dict[key], dict):
-                        current_dict[key] = {}
-                    current_dict = current_dict[key]
+    for env_var, path, convert in _ENV_SCHEMA:
+        value = os.environ.get(env_var)
+        if value is None:
+            continue
+        current_dict = config_data
+        for key in path[:-1]:
+            if not isinstance(current_dict.get(key), dict):
+                current_dict[key] = {}
+            current_dict = current_dict[key]
+        current_dict[path[-1]] = convert(value)
 
     return Config(**config_data)
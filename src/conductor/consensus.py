@@ -0,0 +1,398 @@
+"""Reliable broadcast and common coin for Conductor consensus.
+
+ReliableBroadcast disseminates event batches as erasure-coded fragments
+committed to by a Merkle root; once 2f+1 validators report READY, any k
+fragments reconstruct the batch. CommonCoin derives a shared random bit per
+(day, round) from threshold signature shares.
+"""
+
+import asyncio
+import logging
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Set
+
+import blake3
+import orjson
+from cryptography.hazmat.primitives.asymmetric import ed25519
+
+from conductor.crypto import ThresholdCrypto
+from conductor.erasure import ReedSolomon
+from conductor.hashing import blake3_digest, blake3_hasher
+from conductor.models import (
+    APExportNotice,
+    Event,
+    EventBatch,
+    MembershipChange,
+    ModerationEvent,
+    PostAnnounce,
+    UserRegistration,
+)
+
+logger = logging.getLogger(__name__)
+
+
+# Levels of the fragment Merkle tree kept next to the root. Inclusion proofs
+# stop at the cached layer, so they are this many siblings shorter and
+# verification skips the same number of hashes.
+MERKLE_CACHE_DEPTH = 3
+
+# Fragments up to this size are verified on the event loop: hashing them takes
+# less time than handing the work to a thread and back.
+INLINE_VERIFY_MAX_BYTES = 64 * 1024
+
+# Compact type tags written into serialized batches. Append new event types;
+# renumbering changes every batch id.
+EVENT_TYPE_TAGS = {
+    Event: 0,
+    PostAnnounce: 1,
+    ModerationEvent: 2,
+    UserRegistration: 3,
+    MembershipChange: 4,
+    APExportNotice: 5,
+}
+
+
+@dataclass
+class Fragment:
+    """One erasure-coded shard of a proposed batch."""
+    index: int
+    data: bytes
+    merkle_proof: List[bytes] = field(default_factory=list)  # Sibling digests up to the cached Merkle layer
+    batch_length: Optional[int] = None  # Serialized batch length, for receivers that never saw the proposal
+
+
+class ReliableBroadcast:
+    """Erasure-coded reliable broadcast of event batches among n validators, f of them Byzantine."""
+
+    def __init__(self, n: int, f: int, validators: Optional[Sequence[str]] = None):
+        """
+        Initialize reliable broadcast.
+
+        Args:
+            n: Total number of validators
+            f: Maximum number of Byzantine validators tolerated
+            validators: Validator IDs in slot order; IDs not listed get the
+                next free slot when first heard from
+        """
+        self.n = n
+        self.f = f
+        self.k = n - 2 * f  # Fragments needed to reconstruct a batch
+        if self.k <= 0:
+            raise ValueError("Invalid parameters: k must be positive")
+
+        self.codec = ReedSolomon(self.k, self.n)
+        self.pending_batches: Dict[bytes, Dict[str, Any]] = {}  # batch_id -> proposal state
+        self.received_fragments: Dict[bytes, Dict[int, Fragment]] = defaultdict(dict)  # batch_id -> fragment index -> fragment
+        self.ready_messages: Dict[bytes, int] = defaultdict(int)  # batch_id -> bitmask of validator slots that sent READY
+        self._id_to_slot: Dict[str, int] = {validator_id: slot for slot, validator_id in enumerate(validators or ())}
+        self.delivered_batches: Set[bytes] = set()
+        self.delivered_data: Dict[bytes, bytes] = {}  # batch_id -> reconstructed batch bytes
+        self._reconstructions: Dict[bytes, asyncio.Task] = {}  # batch_id -> decode started at k fragments
+        logger.info("Initialized ReliableBroadcast with n=%s, f=%s, k=%s", n, f, self.k)
+
+    async def rbc_propose(self, batch: EventBatch, proposer_id: str) -> bytes:
+        """
+        Propose a batch: erasure-code it, commit to the fragments and send them out.
+
+        Args:
+            batch: Event batch to broadcast
+            proposer_id: ID of the proposing validator
+
+        Returns:
+            The batch ID (raw BLAKE3 digest of the serialized batch)
+        """
+        batch_data = self._serialize_batch(batch)
+        batch_id = blake3_digest(batch_data)
+
+        fragments = self._erasure_encode(batch_data)
+        levels = self._build_merkle_levels(fragments)
+        proof_steps = len(levels) - 1 - min(MERKLE_CACHE_DEPTH, len(levels) - 1)
+        for fragment in fragments:
+            fragment.merkle_proof = self._merkle_proof(levels, fragment.index, proof_steps)
+
+        self.pending_batches[batch_id] = {
+            "proposer": proposer_id,
+            "merkle_root": levels[-1][0],
+            "merkle_cache": levels[proof_steps],
+            "proof_steps": proof_steps,
+            "length": len(batch_data),
+            "fragment_count": len(fragments),
+            "verified_leaves": {},  # fragment index -> fragment data already proven
+        }
+        logger.info("Proposed batch %s from %s with %s fragments", batch_id[:8].hex(), proposer_id, len(fragments))
+        await self._send_fragments(batch_id, fragments, proposer_id)
+        return batch_id
+
+    def _serialize_batch(self, batch: EventBatch) -> bytes:
+        """Serialize a batch deterministically for hashing and encoding."""
+        events_data = [{"type": EVENT_TYPE_TAGS[type(event)], **event.to_dict()} for event in batch.events]
+        return orjson.dumps(events_data, option=orjson.OPT_SORT_KEYS)
+
+    def _erasure_encode(self, data: bytes) -> List[Fragment]:
+        """Reed-Solomon encode data into n fragments, any k of which recover it."""
+        return [
+            Fragment(index=i, data=shard, batch_length=len(data))
+            for i, shard in enumerate(self.codec.encode(data))
+        ]
+
+    def _create_merkle_tree(self, fragments: List[Fragment]) -> bytes:
+        """Return the Merkle root over the fragments, in index order."""
+        return self._build_merkle_levels(fragments)[-1][0]
+
+    def _build_merkle_levels(self, fragments: List[Fragment]) -> List[List[bytes]]:
+        """Return every level of the fragment Merkle tree, leaves first and root last."""
+        # Nodes are raw 32-byte digests; hex is never needed inside the tree
+        level = [blake3_digest(fragment.data) for fragment in fragments] or [blake3_digest(b"")]
+        levels = [level]
+        # One pooled hasher, reset per node and fed both children, serves the whole tree
+        with blake3_hasher() as hasher:
+            while len(level) > 1:
+                if len(level) % 2:
+                    level.append(level[-1])  # Duplicate the last node on odd levels
+                parents = []
+                for i in range(0, len(level), 2):
+                    hasher.reset()
+                    hasher.update(level[i])
+                    hasher.update(level[i + 1])
+                    parents.append(hasher.digest())
+                level = parents
+                levels.append(level)
+        return levels
+
+    @staticmethod
+    def _merkle_proof(levels: List[List[bytes]], index: int, steps: int) -> List[bytes]:
+        """Sibling digests from leaf index up through the lowest `steps` levels."""
+        proof = []
+        for level in levels[:steps]:
+            proof.append(level[index ^ 1])
+            index >>= 1
+        return proof
+
+    async def _send_fragments(self, batch_id: bytes, fragments: List[Fragment], proposer_id: str) -> None:
+        """Send each fragment to its validator (simulated as local echoes), all at once."""
+        await asyncio.gather(
+            *(self.handle_echo(proposer_id, batch_id, fragment, i) for i, fragment in enumerate(fragments))
+        )
+
+    async def handle_echo(self, sender: str, batch_id: bytes, fragment: Fragment, fragment_index: int) -> None:
+        """
+        Handle an ECHO carrying one fragment of a batch.
+
+        Args:
+            sender: Validator that sent the echo
+            batch_id: Batch the fragment belongs to
+            fragment: The fragment itself
+            fragment_index: Index of the fragment within the batch
+        """
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Received echo from %s for batch %s, fragment %s", sender, batch_id[:8].hex(), fragment_index)
+        if len(fragment.data) <= INLINE_VERIFY_MAX_BYTES:
+            valid = self._verify_fragment(fragment, batch_id)
+        else:
+            # BLAKE3 releases the GIL on large buffers, so concurrent echoes hash in parallel
+            valid = await asyncio.to_thread(self._verify_fragment, fragment, batch_id)
+        if not valid:
+            logger.warning("Invalid fragment %s from %s for batch %s", fragment_index, sender, batch_id[:8].hex())
+            return
+
+        fragments = self.received_fragments[batch_id]
+        if fragment_index in fragments:
+            return  # Duplicate echo
+        fragments[fragment_index] = fragment
+
+        if len(fragments) == self.k and batch_id not in self.delivered_batches:
+            logger.debug("Collected %s fragments for batch %s", self.k, batch_id[:8].hex())
+            # Decode now so the result is ready when the READY quorum lands
+            self._start_reconstruction(batch_id)
+
+    def _verify_fragment(self, fragment: Fragment, batch_id: bytes) -> bool:
+        """Check a fragment's Merkle proof against the batch's cached Merkle layer.
+
+        The proof only covers the levels below the cache, so verification ends
+        with a lookup instead of hashing all the way to the root. Replays of an
+        already proven fragment are settled by a byte comparison, no hashing.
+        """
+        batch = self.pending_batches.get(batch_id)
+        if batch is None:
+            # Proposal not seen yet; the decoded batch is checked against its id
+            return 0 <= fragment.index < self.n
+        index = fragment.index
+        if not 0 <= index < batch["fragment_count"] or len(fragment.merkle_proof) != batch["proof_steps"]:
+            return False
+        verified = batch["verified_leaves"]
+        known = verified.get(index)
+        if known is not None:
+            return known == fragment.data
+        node = blake3_digest(fragment.data)
+        with blake3_hasher() as hasher:
+            for sibling in fragment.merkle_proof:
+                hasher.reset()
+                if index & 1:
+                    hasher.update(sibling)
+                    hasher.update(node)
+                else:
+                    hasher.update(node)
+                    hasher.update(sibling)
+                node = hasher.digest()
+                index >>= 1
+        if batch["merkle_cache"][index] != node:
+            return False
+        verified[fragment.index] = fragment.data
+        return True
+
+    async def handle_ready(self, sender: str, batch_id: bytes) -> None:
+        """
+        Handle a READY message; deliver the batch once 2f+1 validators are ready.
+
+        Args:
+            sender: Validator that sent READY
+            batch_id: Batch the validator is ready to deliver
+        """
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Received ready from %s for batch %s", sender, batch_id[:8].hex())
+        slot = self._id_to_slot.get(sender)
+        if slot is None:
+            slot = self._id_to_slot[sender] = len(self._id_to_slot)
+        ready = self.ready_messages[batch_id] = self.ready_messages[batch_id] | 1 << slot
+
+        if ready.bit_count() >= 2 * self.f + 1 and batch_id not in self.delivered_batches:
+            await self._deliver_batch(batch_id)
+
+    async def _deliver_batch(self, batch_id: bytes) -> None:
+        """Deliver a batch, reusing the reconstruction started when its k-th fragment arrived."""
+        task = self._reconstructions.get(batch_id)
+        if task is None:
+            received = len(self.received_fragments.get(batch_id, ()))
+            if received < self.k:
+                logger.warning("Cannot deliver batch %s: only %s/%s fragments", batch_id[:8].hex(), received, self.k)
+                return
+            task = self._start_reconstruction(batch_id)
+
+        try:
+            reconstructed_data = await task
+        except (ValueError, IndexError) as e:  # Forged shards of mismatched sizes
+            self._reconstructions.pop(batch_id, None)
+            logger.error("Could not reconstruct batch %s: %s", batch_id[:8].hex(), e)
+            return
+        if batch_id in self.delivered_batches:
+            return  # Delivered by a concurrent READY while decoding
+        self._reconstructions.pop(batch_id, None)
+        # Fragments of an unseen proposal were never Merkle-checked; this is what rejects forged ones
+        if blake3_digest(reconstructed_data) != batch_id:
+            logger.error("Reconstructed batch does not match batch id %s", batch_id[:8].hex())
+            return
+
+        self.delivered_data[batch_id] = reconstructed_data
+        self.delivered_batches.add(batch_id)
+        logger.info("Delivered batch %s (%s bytes)", batch_id[:8].hex(), len(reconstructed_data))
+
+    def _start_reconstruction(self, batch_id: bytes) -> asyncio.Task:
+        """Decode the batch from its first k fragments in a worker thread, as a background task."""
+        fragments = list(self.received_fragments[batch_id].values())[:self.k]
+        length = self.pending_batches.get(batch_id, {}).get("length")
+        if length is None:
+            length = fragments[0].batch_length  # Checked along with the data by the digest on delivery
+        task = asyncio.create_task(asyncio.to_thread(self._reconstruct_batch, fragments, length))
+        self._reconstructions[batch_id] = task
+        return task
+
+    def _reconstruct_batch(self, fragments: List[Fragment], length: Optional[int] = None) -> bytes:
+        """
+        Reconstruct the batch bytes from any k fragments.
+
+        Args:
+            fragments: At least k fragments of the batch, in any order
+            length: Original batch length, used to strip encoding padding
+
+        Returns:
+            The reconstructed batch bytes
+        """
+        return self.codec.decode({fragment.index: fragment.data for fragment in fragments}, length)
+
+    def ready_senders(self, batch_id: bytes) -> Set[str]:
+        """Return the IDs of the validators that sent READY for a batch."""
+        mask = self.ready_messages.get(batch_id, 0)
+        return {validator_id for validator_id, slot in self._id_to_slot.items() if mask >> slot & 1}
+
+    def is_delivered(self, batch_id: bytes) -> bool:
+        """Return True once the batch has been delivered."""
+        return batch_id in self.delivered_batches
+
+
+class CommonCoin:
+    """Threshold common coin: one shared random bit per (day, round)."""
+
+    def __init__(self, crypto: ThresholdCrypto, private_key: Optional[bytes] = None):
+        """
+        Args:
+            crypto: Threshold scheme the coin shares are signed and combined with
+            private_key: This validator's key material, loaded up front if given
+        """
+        self.crypto = crypto
+        self.coin_shares: Dict[int, Dict[str, bytes]] = {}  # epoch -> validator_id -> share
+        self.coin_values: Dict[int, int] = {}  # epoch -> coin bit
+        self._signing_keys: Dict[bytes, ed25519.Ed25519PrivateKey] = {}  # key material -> loaded key
+        if private_key is not None:
+            self._signing_key(private_key)
+
+    @staticmethod
+    def _epoch(day: int, round_num: int) -> int:
+        return day * 1000 + round_num
+
+    def _signing_key(self, private_key: bytes) -> ed25519.Ed25519PrivateKey:
+        """Return the loaded signing key for this key material, deriving and parsing it once."""
+        key = self._signing_keys.get(private_key)
+        if key is None:
+            seed = private_key
+            if len(seed) != 32:
+                seed = blake3.blake3(seed, derive_key_context="conductor coin signing key").digest()
+            key = self._signing_keys[private_key] = ed25519.Ed25519PrivateKey.from_private_bytes(seed)
+        return key
+
+    async def coin_share(self, day: int, round_num: int, validator_id: str, private_key: bytes) -> bytes:
+        """
+        Produce this validator's signature share for the (day, round) coin.
+
+        Args:
+            day: Day number
+            round_num: Round within the day
+            validator_id: ID of the signing validator
+            private_key: Validator key material; keys that are not 32-byte
+                Ed25519 seeds are stretched into one with BLAKE3 key derivation
+
+        Returns:
+            The coin share bytes
+        """
+        epoch = self._epoch(day, round_num)
+        shares = self.coin_shares.setdefault(epoch, {})
+        message = f"COIN_{day}_{round_num}".encode()
+        # Shares are indexed in arrival order
+        share = self.crypto.sign_share(message, len(shares) + 1, self._signing_key(private_key))
+        shares[validator_id] = share
+        logger.debug("Generated coin share for day %s, round %s by %s", day, round_num, validator_id)
+        return share
+
+    async def compute_coin(self, day: int, round_num: int, shares: List[bytes]) -> int:
+        """
+        Combine at least t shares into the coin bit.
+
+        Args:
+            day: Day number
+            round_num: Round within the day
+            shares: Signature shares for this (day, round)
+
+        Returns:
+            The coin value, 0 or 1
+        """
+        if len(shares) < self.crypto.t:
+            raise ValueError(f"Insufficient shares for coin: need {self.crypto.t}, got {len(shares)}")
+        aggregated = self.crypto.aggregate_signatures(shares)
+        coin_value = blake3_digest(aggregated)[-1] & 1  # Least significant bit of the hash
+        self.coin_values[self._epoch(day, round_num)] = coin_value
+        logger.info("Computed coin for day %s, round %s: %s", day, round_num, coin_value)
+        return coin_value
+
+    def get_coin_value(self, day: int, round_num: int) -> Optional[int]:
+        """Return the coin for (day, round) if it has been computed."""
+        return self.coin_values.get(self._epoch(day, round_num))
@@ -1,12 +1,46 @@
-import hashlib
+import asyncio
 import secrets
-from typing import List, Tuple
+from collections import OrderedDict
+from typing import List, Sequence, Tuple, Union
 import logging
+import blake3
 from cryptography.hazmat.primitives import serialization
 from cryptography.hazmat.primitives.asymmetric import ed25519
 
+from conductor.ed25519 import verify_batch
+
 logger = logging.getLogger(__name__)
 
+# Largest prime below 2**256. Shamir interpolation divides, so the field must be
+# prime; values still fit the 32-byte share encoding.
+FIELD_PRIME = 2**256 - 189
+
+# Distinct share index sets whose Lagrange weights are kept for reuse.
+LAGRANGE_CACHE_SIZE = 64
+
+# A signature share is a 4-byte big-endian share index followed by a 64-byte
+# Ed25519 signature.
+SHARE_SIZE = 4 + 64
+
+
+def _batch_inverse(values: List[int], modulus: int) -> List[int]:
+    """Invert every value modulo a prime with a single modular exponentiation.
+
+    Montgomery's trick: invert the running product once, then peel each
+    inverse off it with two multiplications.
+    """
+    prefix = []
+    acc = 1
+    for value in values:
+        prefix.append(acc)
+        acc = acc * value % modulus
+    inv = pow(acc, modulus - 2, modulus)
+    inverses = [0] * len(values)
+    for i in range(len(values) - 1, -1, -1):
+        inverses[i] = inv * prefix[i] % modulus
+        inv = inv * values[i] % modulus
+    return inverses
+
 class ThresholdCrypto:
     """Threshold cryptography implementation using Shamir Secret Sharing and BLS signatures."""
     
@@ -25,7 +59,9 @@ class ThresholdCrypto:
             
         self.n = n
         self.t = t
-        self.field_size = 2**256  # Use a large prime field for security
+        self.field_size = FIELD_PRIME
+        self._share_points = tuple(range(1, n + 1))  # Fixed evaluation points for share generation
+        self._lagrange_weights: "OrderedDict[Tuple[int, ...], List[int]]" = OrderedDict()  # share indices -> basis values at 0
         logger.info("Initialized ThresholdCrypto with n=%s, t=%s", n, t)
 
     def generate_shares(self, secret: bytes) -> List[bytes]:
@@ -40,7 +76,7 @@ class ThresholdCrypto:
         """
         if len(secret) > 32:
             # Hash the secret if it's too long
-            secret = hashlib.sha256(secret).digest()
+            secret = blake3.blake3(secret).digest()
             
         # Convert secret to integer
         secret_int = int.from_bytes(secret, 'big') % self.field_size
@@ -51,21 +87,22 @@ class ThresholdCrypto:
             coefficients.append(secrets.randbelow(self.field_size))
             
         # Generate shares by evaluating polynomial at points 1, 2, ..., n
-        shares = []
-        for i in range(1, self.n + 1):
-            share_value = self._evaluate_polynomial(coefficients, i)
-            share_bytes = share_value.to_bytes(32, 'big')
-            shares.append(share_bytes)
+        shares = [value.to_bytes(32, 'big') for value in self._evaluate_polynomial(coefficients, self._share_points)]
             
         logger.debug("Generated %s shares for secret", len(shares))
         return shares
 
-    def _evaluate_polynomial(self, coefficients: List[int], x: int) -> int:
-        """Evaluate polynomial at point x using Horner's method."""
-        result = 0
+    def _evaluate_polynomial(self, coefficients: List[int], xs: Sequence[int]) -> List[int]:
+        """Evaluate polynomial at every point in xs with one Horner sweep.
+
+        Each step updates all points at once, and the modular reduction is
+        deferred to the end: Python ints do not overflow, and each step only
+        adds log2(max(xs)) bits, so t reductions per point become one.
+        """
+        results = [0] * len(xs)
         for coeff in reversed(coefficients):
-            result = (result * x + coeff) % self.field_size
-        return result
+            results = [r * x + coeff for r, x in zip(results, xs)]
+        return [r % self.field_size for r in results]
 
     def reconstruct_secret(self, shares: List[Tuple[int, bytes]]) -> bytes:
         """
@@ -80,40 +117,69 @@ class ThresholdCrypto:
         if len(shares) < self.t:
             raise ValueError(f"Need at least {self.t} shares, got {len(shares)}")
             
-        # Use Lagrange interpolation
-        secret = 0
-        for i, (xi, yi) in enumerate(shares):
-            yi_int = int.from_bytes(yi, 'big')
-            lagrange_basis = 1
-            
-            for j, (xj, _) in enumerate(shares):
-                if i != j:
-                    # Calculate Lagrange basis polynomial
-                    numerator = (-xj) % self.field_size
-                    denominator = (xi - xj) % self.field_size
-                    # Modular inverse
-                    inv_denominator = pow(denominator, self.field_size - 2, self.field_size)
-                    lagrange_basis = (lagrange_basis * numerator * inv_denominator) % self.field_size
-                    
-            secret = (secret + yi_int * lagrange_basis) % self.field_size
-            
+        # Use Lagrange interpolation at x = 0; the weights depend only on the share indices
+        weights = self._lagrange_weights_at_zero(tuple(xi for xi, _ in shares))
+        secret = sum(int.from_bytes(yi, 'big') * weight for (_, yi), weight in zip(shares, weights))
+        secret %= self.field_size
+
         return secret.to_bytes(32, 'big')
 
-    def sign_share(self, message: bytes, share_index: int, private_key: bytes) -> bytes:
+    def _lagrange_weights_at_zero(self, xs: Tuple[int, ...]) -> List[int]:
+        """Return the Lagrange basis values at x = 0 for the given share indices.
+
+        Validators keep reconstructing from the same index sets, so the
+        weights are cached per set and a reconstruction becomes a single
+        dot product with the share values.
+        """
+        cache = self._lagrange_weights
+        weights = cache.get(xs)
+        if weights is not None:
+            cache.move_to_end(xs)
+            return weights
+
+        p = self.field_size
+        numerators = []
+        denominators = []
+        for i, xi in enumerate(xs):
+            numerator = 1
+            denominator = 1
+            for j, xj in enumerate(xs):
+                if i != j:
+                    numerator = numerator * -xj % p
+                    denominator = denominator * (xi - xj) % p
+            numerators.append(numerator)
+            denominators.append(denominator)
+
+        # One modular exponentiation inverts every basis denominator
+        inverses = _batch_inverse(denominators, p)
+        weights = cache[xs] = [numerator * inverse % p for numerator, inverse in zip(numerators, inverses)]
+        if len(cache) > LAGRANGE_CACHE_SIZE:
+            cache.popitem(last=False)
+        return weights
+
+    def sign_share(
+        self,
+        message: bytes,
+        share_index: int,
+        private_key: Union[bytes, ed25519.Ed25519PrivateKey],
+    ) -> bytes:
         """
         Sign message with validator's private key share.
         
         Args:
             message: Message to sign
             share_index: Index of the validator (1-based)
-            private_key: Validator's private key
+            private_key: Validator's raw private key, or an already loaded key
+                object to skip parsing it on every signature
             
         Returns:
             Signature share as bytes
         """
         try:
-            # Load private key
-            private_key_obj = ed25519.Ed25519PrivateKey.from_private_bytes(private_key)
+            if isinstance(private_key, ed25519.Ed25519PrivateKey):
+                private_key_obj = private_key
+            else:
+                private_key_obj = ed25519.Ed25519PrivateKey.from_private_bytes(private_key)
             
             # Sign the message
             signature = private_key_obj.sign(message)
@@ -131,6 +197,10 @@ class ThresholdCrypto:
         """
         Combine signature shares into aggregated signature.
         
+        Ed25519 signatures cannot be folded into one like BLS, so the aggregate
+        is the shares concatenated in sorted order. Signing is deterministic,
+        so the same set of shares always yields the same aggregate.
+        
         Args:
             shares: List of signature shares
             
@@ -140,62 +210,56 @@ class ThresholdCrypto:
         if len(shares) < self.t:
             raise ValueError(f"Need at least {self.t} signature shares, got {len(shares)}")
             
-        # For Ed25519, we can't directly aggregate signatures like BLS
-        # Instead, we collect individual signatures and verify them
-        aggregated = b""
-        for share in shares:
-            if len(share) >= 4:  # Check if share has index prefix
-                aggregated += share
-            else:
-                aggregated += share
-                
+        aggregated = b"".join(sorted(shares))
         logger.debug("Aggregated %s signature shares", len(shares))
         return aggregated
 
-    def verify_aggregated(self, signature: bytes, public_keys: List[bytes]) -> bool:
+    def verify_aggregated(self, message: bytes, signature: bytes, public_keys: List[bytes]) -> bool:
         """
         Verify aggregated signature against public keys.
         
         Args:
-            signature: Aggregated signature
-            public_keys: List of public keys
+            message: Message the shares signed
+            signature: Aggregated signature from aggregate_signatures
+            public_keys: Validator public keys; share index i maps to public_keys[i - 1]
             
         Returns:
-            True if signature is valid, False otherwise
+            True if at least t distinct validators produced valid shares, False otherwise
         """
-        try:
-            # For Ed25519 aggregation, we verify each individual signature
-            # This is a simplified approach; in production, you'd want BLS signatures
-            signature_bytes = signature
-            verified_count = 0
-            
-            # Parse individual signatures from aggregated signature
-            # This is a simplified approach - in reality you'd need proper parsing
-            if len(signature_bytes) < 64:  # Minimum size for one Ed25519 signature
-                logger.warning("Signature too short to contain valid signatures")
-                return False
-                
-            # For now, we'll do a basic verification
-            # In a real implementation, you'd parse individual signatures and verify each
-            for i, pub_key_bytes in enumerate(public_keys):
-                try:
-                    ed25519.Ed25519PublicKey.from_public_bytes(pub_key_bytes)
-                    # This is a simplified verification - in reality you'd extract individual signatures
-                    # and verify each one
-                    verified_count += 1
-                except Exception as e:
-                    logger.debug("Failed to verify signature %s: %s", i, e)
-                    continue
-                    
-            # Require at least threshold number of valid signatures
-            is_valid = verified_count >= self.t
-            logger.debug("Verified %s/%s signatures, valid: %s", verified_count, len(public_keys), is_valid)
-            return is_valid
-            
-        except Exception as e:
-            logger.error("Error verifying aggregated signature: %s", e)
+        if len(signature) % SHARE_SIZE:
+            logger.warning("Aggregated signature length %s is not a multiple of %s", len(signature), SHARE_SIZE)
+            return False
+
+        # Each share names its signer, so all shares are checked in one batch
+        # call and the per-entry results pick out any bad ones. Only the first
+        # share per signer is kept; repeats cannot add to the count.
+        records = {}
+        view = memoryview(signature)
+        for offset in range(0, len(signature), SHARE_SIZE):
+            share_index = int.from_bytes(view[offset:offset + 4], 'big')
+            if 1 <= share_index <= len(public_keys) and share_index not in records:
+                records[share_index] = bytes(view[offset + 4:offset + SHARE_SIZE])
+        if len(records) < self.t:
+            logger.debug("Only %s distinct signers in aggregated signature, need %s", len(records), self.t)
             return False
 
+        results = verify_batch(
+            list(records.values()),
+            [message] * len(records),
+            [public_keys[share_index - 1] for share_index in records],
+        )
+        signers = [share_index for share_index, ok in zip(records, results) if ok]
+        if len(signers) < len(records):
+            logger.debug("Rejected %s invalid signature shares", len(records) - len(signers))
+
+        is_valid = len(signers) >= self.t
+        logger.debug("Verified %s/%s signatures, valid: %s", len(signers), len(public_keys), is_valid)
+        return is_valid
+
+    async def verify_aggregated_async(self, message: bytes, signature: bytes, public_keys: List[bytes]) -> bool:
+        """Run verify_aggregated in a worker thread so the event loop keeps serving."""
+        return await asyncio.to_thread(self.verify_aggregated, message, signature, public_keys)
+
     def generate_keypair(self) -> Tuple[bytes, bytes]:
         """
         Generate a new Ed25519 keypair.
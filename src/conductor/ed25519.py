@@ -0,0 +1,90 @@
+"""Raw-bytes Ed25519 primitives backed by libsodium.
+
+Keys are handled as plain 32-byte seeds and public keys so hot paths (key
+generation for simulated validators, per-batch signing) do not construct
+PyNaCl ``SigningKey``/``VerifyKey`` objects. libsodium picks the fastest
+field arithmetic available on the host CPU when it is loaded.
+"""
+
+from typing import List, Sequence, Tuple
+
+import nacl.bindings
+from nacl.exceptions import BadSignatureError
+
+SEED_SIZE = nacl.bindings.crypto_sign_SEEDBYTES
+PUBLIC_KEY_SIZE = nacl.bindings.crypto_sign_PUBLICKEYBYTES
+SIGNATURE_SIZE = nacl.bindings.crypto_sign_BYTES
+
+
+def keygen() -> Tuple[bytes, bytes]:
+    """Generate a new keypair.
+
+    Returns:
+        Tuple of (seed, public_key), both 32 raw bytes.
+    """
+    public_key, secret_key = nacl.bindings.crypto_sign_keypair()
+    # libsodium's 64-byte secret key is seed || public_key.
+    return secret_key[:SEED_SIZE], public_key
+
+
+def public_key_from_seed(seed: bytes) -> bytes:
+    """Derive the public key for a 32-byte seed."""
+    public_key, _ = nacl.bindings.crypto_sign_seed_keypair(seed)
+    return public_key
+
+
+def read_key_file(path) -> bytes:
+    """Read a hex-encoded key file, the format generate_keys.py writes."""
+    with open(path, "rb") as f:
+        return bytes.fromhex(f.read().strip().decode())
+
+
+def sign(message: bytes, seed: bytes, public_key: bytes) -> bytes:
+    """Return the detached 64-byte signature of message.
+
+    Passing the public key alongside the seed avoids re-deriving it (a full
+    scalar multiplication) on every signature.
+    """
+    return nacl.bindings.crypto_sign(message, seed + public_key)[:SIGNATURE_SIZE]
+
+
+def verify(signature: bytes, message: bytes, public_key: bytes) -> bool:
+    """Check a detached signature, returning False instead of raising."""
+    try:
+        nacl.bindings.crypto_sign_open(signature + message, public_key)
+        return True
+    except (BadSignatureError, ValueError, TypeError):
+        return False
+
+
+def verify_batch(
+    signatures: Sequence[bytes],
+    messages: Sequence[bytes],
+    public_keys: Sequence[bytes],
+) -> List[bool]:
+    """Verify many detached signatures in one call.
+
+    libsodium has no multi-scalar batch API, so this verifies each entry in a
+    tight loop with the binding resolved once. Unlike a true batch check it
+    reports a result per entry, so callers can reject only the offenders.
+
+    Args:
+        signatures: 64-byte signatures.
+        messages: Signed messages, index-aligned with signatures.
+        public_keys: 32-byte public keys, index-aligned with signatures.
+
+    Returns:
+        One bool per entry, True where the signature is valid.
+    """
+    if not len(signatures) == len(messages) == len(public_keys):
+        raise ValueError("signatures, messages and public_keys must have equal length")
+    sign_open = nacl.bindings.crypto_sign_open
+    results = []
+    append = results.append
+    for signature, message, public_key in zip(signatures, messages, public_keys):
+        try:
+            sign_open(signature + message, public_key)
+            append(True)
+        except (BadSignatureError, ValueError, TypeError):
+            append(False)
+    return results
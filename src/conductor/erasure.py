@@ -0,0 +1,150 @@
+"""Systematic Reed-Solomon erasure coding over GF(2^8).
+
+A payload is split into k equal data shards and extended with n - k parity
+shards such that any k of the n shards recover it. The code is systematic:
+shards 0..k-1 are the payload itself, so decoding is a plain concatenation
+when they all arrive. Parity rows come from a Cauchy matrix, every square
+submatrix of which is invertible, so any k shards form a solvable system.
+"""
+
+from typing import Dict, List, Optional, Sequence
+
+# GF(2^8) with the primitive polynomial x^8 + x^4 + x^3 + x^2 + 1 (0x11d).
+_PRIMITIVE_POLY = 0x11D
+
+GF_EXP = [0] * 512
+GF_LOG = [0] * 256
+_x = 1
+for _i in range(255):
+    GF_EXP[_i] = _x
+    GF_LOG[_x] = _i
+    _x <<= 1
+    if _x & 0x100:
+        _x ^= _PRIMITIVE_POLY
+for _i in range(255, 512):
+    GF_EXP[_i] = GF_EXP[_i - 255]
+del _x, _i
+
+
+def gf_mul(a: int, b: int) -> int:
+    """Multiply two field elements."""
+    if a == 0 or b == 0:
+        return 0
+    return GF_EXP[GF_LOG[a] + GF_LOG[b]]
+
+
+def gf_inv(a: int) -> int:
+    """Multiplicative inverse of a non-zero field element."""
+    if a == 0:
+        raise ZeroDivisionError("0 has no inverse in GF(2^8)")
+    return GF_EXP[255 - GF_LOG[a]]
+
+
+# MUL_TABLES[c] maps every byte x to c * x, so bytes.translate multiplies a
+# whole shard by a constant in one C-level pass: the table-lookup analogue of
+# a SIMD vector-by-scalar GF multiply.
+MUL_TABLES = [bytes(gf_mul(c, x) for x in range(256)) for c in range(256)]
+
+
+def _combine(row: Sequence[int], shards: Sequence[bytes], size: int) -> bytes:
+    """Return sum(row[i] * shards[i]) over GF(2^8), shard-wide.
+
+    Products are XOR-accumulated as arbitrary-precision ints, which folds the
+    whole shard per operation instead of one byte at a time.
+    """
+    acc = 0
+    for coeff, shard in zip(row, shards):
+        if coeff == 1:
+            acc ^= int.from_bytes(shard, "little")
+        elif coeff:
+            acc ^= int.from_bytes(shard.translate(MUL_TABLES[coeff]), "little")
+    return acc.to_bytes(size, "little")
+
+
+def _invert_matrix(matrix: List[List[int]]) -> List[List[int]]:
+    """Gauss-Jordan inversion of a square matrix over GF(2^8)."""
+    size = len(matrix)
+    work = [row[:] + [int(i == j) for j in range(size)] for i, row in enumerate(matrix)]
+    for col in range(size):
+        pivot = next((r for r in range(col, size) if work[r][col]), None)
+        if pivot is None:
+            raise ValueError("Matrix is singular")
+        work[col], work[pivot] = work[pivot], work[col]
+        inv = gf_inv(work[col][col])
+        work[col] = [gf_mul(v, inv) for v in work[col]]
+        for r in range(size):
+            factor = work[r][col]
+            if r != col and factor:
+                work[r] = [v ^ gf_mul(factor, p) for v, p in zip(work[r], work[col])]
+    return [row[size:] for row in work]
+
+
+class ReedSolomon:
+    """Systematic (k, n) Reed-Solomon codec over GF(2^8)."""
+
+    def __init__(self, k: int, n: int):
+        """
+        Args:
+            k: Number of data shards; any k shards recover the payload.
+            n: Total number of shards, at most 256.
+        """
+        if not 0 < k <= n:
+            raise ValueError("Reed-Solomon requires 0 < k <= n")
+        if n > 256:
+            raise ValueError("GF(2^8) Reed-Solomon supports at most 256 shards")
+        self.k = k
+        self.n = n
+        # Cauchy parity rows: 1 / (x_i + y_j) with x_i = k + i, y_j = j, all distinct.
+        self.parity_matrix = [[gf_inv((k + i) ^ j) for j in range(k)] for i in range(n - k)]
+        self._decode_matrices: Dict[tuple, List[List[int]]] = {}
+
+    def shard_size(self, length: int) -> int:
+        """Size of each shard for a payload of the given length."""
+        return max(1, -(-length // self.k))
+
+    def encode(self, data: bytes) -> List[bytes]:
+        """Split data into n shards, zero-padding it to a multiple of k.
+
+        Returns:
+            n equally sized shards; the first k are the padded payload.
+        """
+        size = self.shard_size(len(data))
+        padded = data.ljust(size * self.k, b"\0")
+        data_shards = [padded[i * size:(i + 1) * size] for i in range(self.k)]
+        return data_shards + [_combine(row, data_shards, size) for row in self.parity_matrix]
+
+    def decode(self, shards: Dict[int, bytes], length: Optional[int] = None) -> bytes:
+        """Recover the payload from any k shards.
+
+        Args:
+            shards: Shard index -> shard bytes; at least k entries of equal size.
+            length: Original payload length, used to strip padding.
+
+        Returns:
+            The reconstructed payload.
+        """
+        if len(shards) < self.k:
+            raise ValueError(f"Need at least {self.k} shards, got {len(shards)}")
+        if all(i in shards for i in range(self.k)):
+            pieces = [shards[i] for i in range(self.k)]
+        else:
+            indices = tuple(sorted(shards)[:self.k])
+            pieces = self._solve(indices, [shards[i] for i in indices])
+        if length is not None:
+            # Trim the padding before joining so the payload is copied exactly once
+            size = len(pieces[0])
+            full, tail = divmod(length, size)
+            pieces = pieces[:full] + ([pieces[full][:tail]] if tail else [])
+        return b"".join(pieces)
+
+    def _solve(self, indices: Sequence[int], available: List[bytes]) -> List[bytes]:
+        """Solve for the k data shards from the shards at the given indices."""
+        inverse = self._decode_matrices.get(indices)
+        if inverse is None:
+            rows = [
+                [int(i == j) for j in range(self.k)] if i < self.k else self.parity_matrix[i - self.k]
+                for i in indices
+            ]
+            inverse = self._decode_matrices[indices] = _invert_matrix(rows)
+        size = len(available[0])
+        return [_combine(row, available, size) for row in inverse]
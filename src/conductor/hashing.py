@@ -1,7 +1,38 @@
 import json
-from typing import Any
+import threading
+from contextlib import contextmanager
+from typing import Any, Iterator
 import blake3
 
+# Per-thread hasher instances, reset between uses instead of reallocated.
+_TLS = threading.local()
+
+# Inputs at least this large are hashed with BLAKE3's multithreaded tree mode;
+# below it, spinning up the thread pool costs more than it saves.
+PARALLEL_HASH_THRESHOLD = 128 * 1024
+
+def _oneshot(data: Any) -> "blake3.blake3":
+    """Feeds data into this thread's reset one-shot hasher and returns it."""
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        data_bytes = data  # Hashed in place, no copy or JSON round-trip
+    elif isinstance(data, str):
+        data_bytes = data.encode('utf-8')
+    else:
+        # Attempt to serialize to JSON if not string or bytes
+        data_bytes = json.dumps(data, sort_keys=True).encode('utf-8')
+
+    if len(data_bytes) >= PARALLEL_HASH_THRESHOLD:
+        return blake3.blake3(data_bytes, max_threads=blake3.blake3.AUTO)
+
+    hasher = getattr(_TLS, "oneshot", None)
+    if hasher is None:
+        hasher = _TLS.oneshot = blake3.blake3()
+    else:
+        hasher.reset()
+    hasher.update(data_bytes)
+    return hasher
+
+
 def blake3_hash(data: Any) -> str:
     """Generates a BLAKE3 hash for the given data.
 
@@ -11,12 +42,44 @@ def blake3_hash(data: Any) -> str:
     Returns:
         A hexadecimal string representation of the BLAKE3 hash.
     """
-    if isinstance(data, str):
-        data_bytes = data.encode('utf-8')
-    elif isinstance(data, bytes):
-        data_bytes = data
-    else:
-        # Attempt to serialize to JSON if not string or bytes
-        data_bytes = json.dumps(data, sort_keys=True).encode('utf-8')
+    return _oneshot(data).hexdigest()
+
+
+def blake3_digest(data: Any) -> bytes:
+    """Generates a raw BLAKE3 digest for the given data.
+
+    Prefer this over blake3_hash for values that are only compared, sorted or
+    re-hashed; hex is for I/O boundaries such as logs and JSON.
+
+    Args:
+        data: The data to be hashed. Can be a string, a bytes-like object, or a
+            serializable object.
+
+    Returns:
+        The 32-byte BLAKE3 digest.
+    """
+    return _oneshot(data).digest()
+
+
+@contextmanager
+def blake3_hasher() -> Iterator["blake3.blake3"]:
+    """Lends this thread's pooled incremental BLAKE3 hasher, freshly reset.
 
-    return blake3.blake3(data_bytes).hexdigest()
+    Feeding parts with update() avoids building an intermediate joined string
+    or list just to hash it. Read the digest inside the with block; the hasher
+    is reused once the block exits. Nested or interleaved uses get their own
+    hasher.
+
+    Yields:
+        A blake3 hasher object; call hexdigest() or digest() when done.
+    """
+    hasher = getattr(_TLS, "stream", None)
+    if hasher is None:
+        hasher = blake3.blake3()
+    else:
+        _TLS.stream = None  # Lent out until the block exits
+        hasher.reset()
+    try:
+        yield hasher
+    finally:
+        _TLS.stream = hasher
@@ -2,43 +2,63 @@
 
 import structlog
 import logging
+import orjson
 import sys
 from typing import Any, Dict
 
+def _orjson_dumps(obj: Any, default: Any = None, **kwargs) -> str:
+    """JSON serializer for structlog's JSONRenderer backed by orjson."""
+    return orjson.dumps(obj, default=default).decode()
+
+
 def configure_logging(log_level: str = "INFO", enable_json: bool = True):
     """
     Configure structured logging for Conductor.
+
+    Both structlog and standard library loggers are rendered by a single
+    ProcessorFormatter on the root handler, so each record is formatted once.
     
     Args:
         log_level: Logging level (DEBUG, INFO, WARN, ERROR)
         enable_json: Whether to use JSON formatting
     """
-    # Configure standard library logging
-    logging.basicConfig(
-        level=getattr(logging, log_level.upper()),
-        stream=sys.stdout,
-        format="%(message)s"
-    )
-    
-    # Configure structlog
-    processors = [
+    level = logging.getLevelName(log_level.upper())
+
+    # Processors shared by structlog loggers and plain logging records
+    shared_processors = [
         structlog.contextvars.merge_contextvars,
+        structlog.stdlib.add_logger_name,
         structlog.processors.add_log_level,
-        structlog.processors.TimeStamper(fmt="iso"),
+        structlog.processors.TimeStamper(fmt="iso", utc=True),
     ]
     
     if enable_json:
-        processors.append(structlog.processors.JSONRenderer())
+        renderer = structlog.processors.JSONRenderer(serializer=_orjson_dumps)
     else:
-        processors.append(structlog.dev.ConsoleRenderer())
+        renderer = structlog.dev.ConsoleRenderer()
+
+    formatter = structlog.stdlib.ProcessorFormatter(
+        foreign_pre_chain=shared_processors,
+        processors=[
+            structlog.stdlib.ProcessorFormatter.remove_processors_meta,
+            structlog.processors.format_exc_info,
+            renderer,
+        ],
+    )
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(formatter)
+
+    # Configure standard library logging
+    root_logger = logging.getLogger()
+    root_logger.handlers.clear()
+    root_logger.addHandler(handler)
+    root_logger.setLevel(level)
         
     structlog.configure(
-        processors=processors,
-        wrapper_class=structlog.make_filtering_bound_logger(
-            logging.getLevelName(log_level.upper())
-        ),
+        processors=shared_processors + [structlog.stdlib.ProcessorFormatter.wrap_for_formatter],
+        wrapper_class=structlog.make_filtering_bound_logger(level),
         context_class=dict,
-        logger_factory=structlog.PrintLoggerFactory(),
+        logger_factory=structlog.stdlib.LoggerFactory(),
         cache_logger_on_first_use=True,
     )
 
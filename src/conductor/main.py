@@ -2,9 +2,13 @@
 
 import asyncio
 import logging
+import os
+import queue
 import signal
 import sys
+import threading
 from pathlib import Path
+from typing import Dict, Optional, Tuple
 
 from conductor.config import load_config
 from conductor.logging_config import configure_logging, get_logger
@@ -17,6 +21,42 @@ import uvicorn
 
 logger = get_logger(__name__)
 
+# Keypairs already loaded or generated, keyed by resolved keypair path.
+_keypair_cache: Dict[str, Tuple[bytes, bytes]] = {}
+
+# Spare keypair generated off the event loop, ready for a first start.
+_spare_keypairs: "queue.Queue[Tuple[bytes, bytes]]" = queue.Queue(maxsize=1)
+_prewarm_thread: Optional[threading.Thread] = None
+
+
+def _fill_spare_keypairs() -> None:
+    """Generate one spare keypair and exit."""
+    from conductor.crypto import ThresholdCrypto
+
+    crypto = ThresholdCrypto(n=3, t=2)
+    _spare_keypairs.put(crypto.generate_keypair())
+
+
+def _start_keypair_prewarm() -> None:
+    """Start the one-shot background keypair generator once per process."""
+    global _prewarm_thread
+    if _prewarm_thread is None:
+        _prewarm_thread = threading.Thread(
+            target=_fill_spare_keypairs, name="keypair-prewarm", daemon=True
+        )
+        _prewarm_thread.start()
+
+
+def _write_key_file(path: Path, data: bytes) -> None:
+    """Write key material readable only by its owner and fsync it to disk."""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_CLOEXEC", 0), 0o600)
+    try:
+        os.write(fd, data)
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
 class ConductorApplication:
     """Main Conductor application."""
     
@@ -28,6 +68,10 @@ class ConductorApplication:
         self.grpc_server = None
         self.rest_server = None
         self.running = False
+        self._stopped = asyncio.Event()  # Set once stop() has finished
+        if not Path(self.config.validator.keypair_path).exists():
+            # Overlap key generation with the rest of startup
+            _start_keypair_prewarm()
         
     async def start(self):
         """Start the Conductor application."""
@@ -79,14 +123,15 @@ class ConductorApplication:
                         app,
                         host="0.0.0.0",
                         port=8080,
-                        log_level="info"
+                        log_level="info",
+                        # Explicit so a missing uvicorn[standard] extra fails at startup
+                        # instead of silently falling back to the pure-Python stack
+                        loop="asyncio" if sys.platform == "win32" else "uvloop",
+                        http="httptools"
                     )
                 ).serve()
             )
             
-            # Start metrics server
-            metrics._start_server()
-            
             self.running = True
             logger.info("Conductor application started successfully")
             
@@ -99,6 +144,7 @@ class ConductorApplication:
         if not self.running:
             return
             
+        self.running = False  # A second stop() while this one runs is a no-op
         logger.info("Stopping Conductor application")
         
         try:
@@ -106,9 +152,10 @@ class ConductorApplication:
             if self.rest_server:
                 self.rest_server.cancel()
                 
-            # Stop gRPC server
+            # Stop gRPC server; cancelling serve_grpc stops it gracefully
             if self.grpc_server:
                 self.grpc_server.cancel()
+                await asyncio.gather(self.grpc_server, return_exceptions=True)
                 
             # Stop network manager
             if self.network_manager:
@@ -116,40 +163,63 @@ class ConductorApplication:
                 
             # Stop validator node
             if self.validator_node:
-                # In a real implementation, you'd have a proper shutdown method
-                pass
+                await self.validator_node.stop()
+
+            # Publish buffered metrics
+            await metrics.close()
                 
-            self.running = False
             logger.info("Conductor application stopped")
             
         except Exception as e:
             logger.error("Error stopping Conductor application", error=str(e))
+        finally:
+            self._stopped.set()
             
     async def _get_or_generate_keypair(self):
-        """Get existing keypair or generate new one."""
+        """Get existing keypair or generate new one.
+
+        The private key lives at keypair_path as a hex-encoded seed, the format
+        generate_keys.py writes, and the public key in a hex ``.pub`` file beside
+        it. Keypairs are cached per path for the life of the process.
+        """
         from conductor.crypto import ThresholdCrypto
+        from conductor.ed25519 import public_key_from_seed, read_key_file
         
         keypair_path = Path(self.config.validator.keypair_path)
+        cache_key = str(keypair_path.resolve())
+        cached = _keypair_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        public_key_path = keypair_path.with_name(keypair_path.name + ".pub")
         
         if keypair_path.exists():
             # Load existing keypair
-            with open(keypair_path, 'rb') as f:
-                private_key = f.read()
-            # In a real implementation, you'd also load the public key
-            public_key = b"loaded_public_key"  # Placeholder
-            return (private_key, public_key)
+            private_key = read_key_file(keypair_path)
+            if public_key_path.exists():
+                public_key = read_key_file(public_key_path)
+            else:
+                # Keys from generate_keys.py have no sidecar: derive once and persist
+                public_key = public_key_from_seed(private_key)
+                _write_key_file(public_key_path, public_key.hex().encode())
         else:
-            # Generate new keypair
-            crypto = ThresholdCrypto(n=3, t=2)
-            private_key, public_key = crypto.generate_keypair()
+            # Take a prewarmed keypair, generating one off the event loop on a miss
+            try:
+                private_key, public_key = _spare_keypairs.get_nowait()
+            except queue.Empty:
+                crypto = ThresholdCrypto(n=3, t=2)
+                private_key, public_key = await asyncio.get_running_loop().run_in_executor(
+                    None, crypto.generate_keypair
+                )
             
             # Save keypair
             keypair_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(keypair_path, 'wb') as f:
-                f.write(private_key)
+            _write_key_file(keypair_path, private_key.hex().encode())
+            _write_key_file(public_key_path, public_key.hex().encode())
                 
             logger.info("Generated new validator keypair")
-            return (private_key, public_key)
+
+        keypair = _keypair_cache[cache_key] = (private_key, public_key)
+        return keypair
             
     def _get_validator_ids(self):
         """Get validator IDs from configuration."""
@@ -168,24 +238,30 @@ async def main():
     # Create application
     app = ConductorApplication(config_path)
     
-    # Set up signal handlers
-    def signal_handler(signum, frame):
-        logger.info(f"Received signal {signum}, shutting down...")
-        asyncio.create_task(app.stop())
-        
-    signal.signal(signal.SIGINT, signal_handler)
-    signal.signal(signal.SIGTERM, signal_handler)
+    # Set up signal handlers: a signal starts app.stop() on the loop, which
+    # sets app._stopped once shutdown completes
+    loop = asyncio.get_running_loop()
+    shutdown_tasks = set()
+
+    def request_shutdown():
+        logger.info("Received shutdown signal, shutting down...")
+        task = loop.create_task(app.stop())
+        shutdown_tasks.add(task)
+        task.add_done_callback(shutdown_tasks.discard)
+
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(signum, request_shutdown)
+        except NotImplementedError:  # Windows event loops have no add_signal_handler
+            signal.signal(signum, lambda *_: loop.call_soon_threadsafe(request_shutdown))
     
     try:
         # Start application
         await app.start()
         
-        # Keep running until stopped
-        while app.running:
-            await asyncio.sleep(1)
+        # Keep running until the application has stopped
+        await app._stopped.wait()
             
-    except KeyboardInterrupt:
-        logger.info("Received keyboard interrupt, shutting down...")
     except Exception as e:
         logger.error("Fatal error in main", error=str(e))
         sys.exit(1)
@@ -194,4 +270,7 @@ async def main():
 
 
 if __name__ == "__main__":
+    if sys.platform != "win32":  # uvloop is not available on Windows
+        import uvloop
+        uvloop.install()
     asyncio.run(main())
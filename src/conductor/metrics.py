@@ -1,151 +1,212 @@
 """Prometheus metrics for Conductor."""
 
+import asyncio
 import time
-from typing import Dict, List
-from prometheus_client import Counter, Histogram, Gauge, start_http_server, CollectorRegistry
+from bisect import bisect_left
+from typing import Dict, List, Optional, Tuple
+from prometheus_client import Counter, Histogram, Gauge, CollectorRegistry
+
+# Registry every Conductor metric is registered on; the REST app's /metrics
+# route exposes it.
+REGISTRY = CollectorRegistry()
 
 # Consensus metrics
 consensus_rounds = Counter(
     'conductor_consensus_rounds_total',
     'Total consensus rounds',
-    ['status']  # success, failure, timeout
+    ['status'],  # success, failure, timeout
+    registry=REGISTRY
 )
 
 consensus_duration = Histogram(
     'conductor_consensus_duration_seconds',
     'Consensus round duration in seconds',
-    buckets=[0.1, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0, 60.0, 120.0]
+    buckets=[0.1, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0, 60.0, 120.0],
+    registry=REGISTRY
 )
 
 event_batch_size = Histogram(
     'conductor_event_batch_size_bytes',
     'Event batch size in bytes',
-    buckets=[100, 1000, 10000, 100000, 1000000, 10000000]
+    buckets=[100, 1000, 10000, 100000, 1000000, 10000000],
+    registry=REGISTRY
 )
 
 # VDF metrics
 vdf_computation_duration = Histogram(
     'conductor_vdf_computation_duration_seconds',
     'VDF computation duration in seconds',
-    buckets=[3600, 7200, 14400, 21600, 28800, 36000, 43200, 86400]  # 1h to 24h
+    buckets=[3600, 7200, 14400, 21600, 28800, 36000, 43200, 86400],  # 1h to 24h
+    registry=REGISTRY
 )
 
 vdf_difficulty = Gauge(
     'conductor_vdf_difficulty',
-    'Current VDF difficulty (iterations)'
+    'Current VDF difficulty (iterations)',
+    registry=REGISTRY
 )
 
 day_number = Gauge(
     'conductor_day_number_current',
-    'Current day number'
+    'Current day number',
+    registry=REGISTRY
 )
 
 # Network metrics
 rbc_messages = Counter(
     'conductor_rbc_messages_total',
     'RBC messages by type',
-    ['message_type']  # propose, echo, ready
+    ['message_type'],  # propose, echo, ready
+    registry=REGISTRY
 )
 
 peer_connections = Gauge(
     'conductor_peer_connections',
-    'Active peer connections'
+    'Active peer connections',
+    registry=REGISTRY
 )
 
 network_latency = Histogram(
     'conductor_network_latency_seconds',
     'Network message latency',
     ['peer_id'],
-    buckets=[0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0]
+    buckets=[0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0],
+    registry=REGISTRY
 )
 
 # Storage metrics
 storage_operations = Counter(
     'conductor_storage_operations_total',
     'Storage operations',
-    ['operation', 'status']  # read, write, delete; success, failure
+    ['operation', 'status'],  # read, write, delete; success, failure
+    registry=REGISTRY
 )
 
 storage_size_bytes = Gauge(
     'conductor_storage_size_bytes',
-    'Storage size in bytes'
+    'Storage size in bytes',
+    registry=REGISTRY
 )
 
 # API metrics
 grpc_requests = Counter(
     'conductor_grpc_requests_total',
     'gRPC requests',
-    ['method', 'status']  # GetDayProof, SubmitEventBatch; success, failure
+    ['method', 'status'],  # GetDayProof, SubmitEventBatch; success, failure
+    registry=REGISTRY
 )
 
 grpc_latency = Histogram(
     'conductor_grpc_latency_seconds',
     'gRPC request latency',
     ['method'],
-    buckets=[0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0]
+    buckets=[0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0],
+    registry=REGISTRY
 )
 
 rest_requests = Counter(
     'conductor_rest_requests_total',
     'REST API requests',
-    ['endpoint', 'method', 'status']
+    ['endpoint', 'method', 'status'],
+    registry=REGISTRY
 )
 
 rest_latency = Histogram(
     'conductor_rest_latency_seconds',
     'REST API latency',
     ['endpoint', 'method'],
-    buckets=[0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0]
+    buckets=[0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0],
+    registry=REGISTRY
 )
 
 # Blacklist metrics
 blacklist_size = Gauge(
     'conductor_blacklist_size',
-    'Number of blacklisted validators'
+    'Number of blacklisted validators',
+    registry=REGISTRY
 )
 
 blacklist_votes = Counter(
     'conductor_blacklist_votes_total',
     'Blacklist votes',
-    ['target_validator', 'action']  # add, remove
+    ['target_validator', 'action'],  # add, remove
+    registry=REGISTRY
 )
 
 # System metrics
 memory_usage_bytes = Gauge(
     'conductor_memory_usage_bytes',
-    'Memory usage in bytes'
+    'Memory usage in bytes',
+    registry=REGISTRY
 )
 
 cpu_usage_percent = Gauge(
     'conductor_cpu_usage_percent',
-    'CPU usage percentage'
+    'CPU usage percentage',
+    registry=REGISTRY
 )
 
 disk_usage_bytes = Gauge(
     'conductor_disk_usage_bytes',
-    'Disk usage in bytes'
+    'Disk usage in bytes',
+    registry=REGISTRY
 )
 
 
+# Seconds between publishing buffered per-request metrics.
+METRICS_FLUSH_INTERVAL = 0.1
+
+# Buffered records that trigger an immediate flush, bounding memory when no
+# event loop is running the flush task.
+METRICS_FLUSH_THRESHOLD = 1024
+
+
+def _observe_many(histogram: Histogram, samples: List[float]) -> None:
+    """Record a batch of observations on a histogram child.
+
+    Samples are binned with bisect and each touched bucket is incremented once
+    by its count, instead of one observe() call (a bucket walk and lock per
+    update) per sample. Falls back to observe() if prometheus_client's
+    histogram internals change.
+    """
+    upper_bounds = getattr(histogram, "_upper_bounds", None)
+    buckets = getattr(histogram, "_buckets", None)
+    total = getattr(histogram, "_sum", None)
+    if upper_bounds is None or buckets is None or total is None:
+        for sample in samples:
+            histogram.observe(sample)
+        return
+    counts: Dict[int, int] = {}
+    for sample in samples:
+        index = bisect_left(upper_bounds, sample)  # First bound >= sample; the last bound is +Inf
+        counts[index] = counts.get(index, 0) + 1
+    for index, count in counts.items():
+        buckets[index].inc(count)
+    total.inc(sum(samples))
+
+
 class MetricsCollector:
-    """Centralized metrics collection for Conductor."""
+    """Centralized metrics collection for Conductor.
+
+    High-rate recorders (RBC messages, network latency, gRPC/REST requests,
+    storage operations) buffer counts and latencies per label tuple and publish
+    them every METRICS_FLUSH_INTERVAL, so Prometheus' per-metric locks are taken
+    once per label tuple per flush instead of once per event. The buffers are
+    plain dicts: recorders run on the event loop thread.
+    """
     
-    def __init__(self, port: int = 9090):
-        self.port = port
-        self.registry = CollectorRegistry()
-        self._start_server()
-        
-    def _start_server(self):
-        """Start Prometheus metrics server."""
-        try:
-            start_http_server(self.port, registry=self.registry)
-            print(f"Metrics server started on port {self.port}")
-        except Exception as e:
-            print(f"Failed to start metrics server: {e}")
+    def __init__(self):
+        self.registry = REGISTRY
+        self._pending_counts: Dict[Tuple[Counter, Tuple[str, ...]], int] = {}
+        self._pending_latencies: Dict[Tuple[Histogram, Tuple[str, ...]], List[float]] = {}
+        self._pending_records = 0
+        self._flush_task: Optional[asyncio.Task] = None
+        # Labelled children resolved once per (metric, label values)
+        self._children: Dict[Tuple[object, Tuple[str, ...]], object] = {}
             
     def record_consensus_round(self, status: str, duration: float):
         """Record consensus round metrics."""
-        consensus_rounds.labels(status=status).inc()
+        self._child(consensus_rounds, (status,)).inc()
         consensus_duration.observe(duration)
         
     def record_vdf_computation(self, duration: float, difficulty: int):
@@ -159,25 +220,91 @@ class MetricsCollector:
         
     def record_rbc_message(self, message_type: str):
         """Record RBC message metrics."""
-        rbc_messages.labels(message_type=message_type).inc()
+        self._count(rbc_messages, (message_type,))
+        self._record_done()
         
     def record_network_latency(self, peer_id: str, latency: float):
         """Record network latency metrics."""
-        network_latency.labels(peer_id=peer_id).observe(latency)
+        self._observe(network_latency, (peer_id,), latency)
+        self._record_done()
         
     def record_storage_operation(self, operation: str, status: str):
         """Record storage operation metrics."""
-        storage_operations.labels(operation=operation, status=status).inc()
+        self._count(storage_operations, (operation, status))
+        self._record_done()
         
     def record_grpc_request(self, method: str, status: str, latency: float):
         """Record gRPC request metrics."""
-        grpc_requests.labels(method=method, status=status).inc()
-        grpc_latency.labels(method=method).observe(latency)
+        self._count(grpc_requests, (method, status))
+        self._observe(grpc_latency, (method,), latency)
+        self._record_done()
         
     def record_rest_request(self, endpoint: str, method: str, status: str, latency: float):
         """Record REST request metrics."""
-        rest_requests.labels(endpoint=endpoint, method=method, status=status).inc()
-        rest_latency.labels(endpoint=endpoint, method=method).observe(latency)
+        self._count(rest_requests, (endpoint, method, status))
+        self._observe(rest_latency, (endpoint, method), latency)
+        self._record_done()
+
+    def _count(self, counter: Counter, labels: Tuple[str, ...]) -> None:
+        key = (counter, labels)
+        self._pending_counts[key] = self._pending_counts.get(key, 0) + 1
+
+    def _observe(self, histogram: Histogram, labels: Tuple[str, ...], value: float) -> None:
+        samples = self._pending_latencies.get((histogram, labels))
+        if samples is None:
+            self._pending_latencies[(histogram, labels)] = [value]
+        else:
+            samples.append(value)
+
+    def _record_done(self) -> None:
+        """Flush when the buffer is full; otherwise make sure the flush task is running."""
+        self._pending_records += 1
+        if self._pending_records >= METRICS_FLUSH_THRESHOLD:
+            self.flush()
+        if self._flush_task is None or self._flush_task.done():
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                return  # No loop yet; the size threshold or an explicit flush() publishes
+            self._flush_task = loop.create_task(self._flush_loop())
+
+    def flush(self) -> None:
+        """Publish buffered counts and latencies to Prometheus."""
+        counts, self._pending_counts = self._pending_counts, {}
+        latencies, self._pending_latencies = self._pending_latencies, {}
+        self._pending_records = 0
+        for (counter, labels), count in counts.items():
+            self._child(counter, labels).inc(count)
+        for (histogram, labels), samples in latencies.items():
+            _observe_many(self._child(histogram, labels), samples)
+
+    def _child(self, metric, labels: Tuple[str, ...]):
+        """Return the metric's child for these label values, resolving labels() once."""
+        key = (metric, labels)
+        child = self._children.get(key)
+        if child is None:
+            child = self._children[key] = metric.labels(*labels)
+        return child
+
+    async def _flush_loop(self) -> None:
+        try:
+            while True:
+                await asyncio.sleep(METRICS_FLUSH_INTERVAL)
+                self.flush()
+        except asyncio.CancelledError:
+            self.flush()
+            raise
+
+    async def close(self) -> None:
+        """Stop the flush task, publishing anything still buffered."""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+            self._flush_task = None
+        self.flush()
         
     def update_system_metrics(self, memory_bytes: int, cpu_percent: float, disk_bytes: int):
         """Update system resource metrics."""
@@ -199,7 +326,7 @@ class MetricsCollector:
         
     def record_blacklist_vote(self, target_validator: str, action: str):
         """Record blacklist vote."""
-        blacklist_votes.labels(target_validator=target_validator, action=action).inc()
+        self._child(blacklist_votes, (target_validator, action)).inc()
 
 
 # Global metrics collector instance
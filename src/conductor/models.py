@@ -1,41 +1,68 @@
-from dataclasses import dataclass
-from typing import List, Optional, Dict, Any
+from array import array
+from dataclasses import asdict, dataclass
+from itertools import accumulate
+from typing import Iterator, Sequence, List, Optional, Dict, Any
 
 # --- Exceptions ---
 class ConsensusError(Exception):
     """Custom exception for consensus-related errors."""
     pass
 
+class CachedDictMixin:
+    """Memoizes the dict form of a dataclass.
+
+    Events and messages are frozen dataclasses, so the recursive copy made by
+    dataclasses.asdict is done on the first to_dict() call and reused after.
+    The returned dict is shared and must not be mutated. The cache lives in a
+    slot so slotted subclasses stay free of a per-instance __dict__.
+    """
+    __slots__ = ("_serialized",)
+
+    def to_dict(self) -> Dict[str, Any]:
+        cached = getattr(self, "_serialized", None)
+        if cached is None:
+            cached = asdict(self)
+            object.__setattr__(self, "_serialized", cached)
+        return cached
+
 # --- Event Data Models ---
 
-@dataclass
-class Event:
+@dataclass(frozen=True, slots=True)
+class Event(CachedDictMixin):
     """Base class for all events in the Conductor network."""
     creation_day: int
     sig: str  # Ed25519 signature
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class PostAnnounce(Event):
     """Represents an announcement of a new post."""
     content_cid: str
     author_pubkey_hash: str
     community_id: str
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ModerationEvent(Event):
     """Represents a moderation action."""
     target_ref: str
     action: str
     reason_hash: str
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class UserRegistration(Event):
     """Represents a new user registration."""
     user_pubkey: str
     registration_day: int
     day_proof_hash: str
 
-@dataclass
+@dataclass(frozen=True, slots=True)
+class QuorumCertificate:
+    """Represents a cryptographic quorum certificate for a block or day proof."""
+    epoch_or_day: int
+    payload_hash: str # Hash of the data being certified (e.g., block hash, day proof hash)
+    signatures: Dict[str, str] # Dictionary of validator_id -> signature_share
+    aggregated_signature: Optional[str] = None # The combined signature once enough shares are collected
+
+@dataclass(frozen=True, slots=True)
 class DayProof:
     """Represents a computed day proof as per CFP-001 Proof Object."""
     day_number: int
@@ -45,7 +72,7 @@ class DayProof:
     signature: bytes
     quorum_cert: Optional[QuorumCertificate] = None # Quorum certificate for this day proof
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class MembershipChange(Event):
     """Represents a change in validator membership."""
     change_type: str  # e.g., "add", "remove"
@@ -53,82 +80,118 @@ class MembershipChange(Event):
     effective_day: int
     quorum_sig: str
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ThresholdSignature:
     """Represents a threshold signature, including individual shares and the aggregated signature."""
     epoch: int
     signer_id: str
-    signature_share: str # Individual share of the signature
+    signature_share: bytes # Individual share of the signature
     aggregated_signature: Optional[str] = None # The combined signature once enough shares are collected
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class EncryptedShare:
     """Represents a single encrypted share of a payload."""
     share_id: int
-    data: str # The encrypted data for this share
+    data: bytes # The encrypted data for this share
     # In a real implementation, this would also include metadata like encryption key info, etc.
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class APExportNotice(Event):
     """Represents a notice for exporting content to ActivityPub."""
     object_ref: str
     policy_hash: str
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class EventBatch:
     """Placeholder for a batch of events received via gRPC."""
     events: List[Event]
 
+class EventColumns:
+    """Column-oriented view of a batch of events.
+
+    Holds creation days in a typed array and signatures as a list of references,
+    so decoding a batch does not allocate one Event per row. An Event is only
+    built when a consumer indexes or iterates the columns. The wire encoding of
+    every event is kept in one contiguous buffer, with offsets[i]:offsets[i + 1]
+    delimiting event i, so the batch can be hashed in a single pass.
+    """
+    __slots__ = ("creation_days", "sigs", "wire", "offsets")
+
+    def __init__(self, creation_days: array, sigs: List[Any], wire: bytes = b"", offsets: Optional[array] = None):
+        self.creation_days = creation_days
+        self.sigs = sigs
+        self.wire = wire
+        self.offsets = offsets if offsets is not None else array("Q", [0])
+
+    @classmethod
+    def from_proto(cls, events: Sequence[Any]) -> "EventColumns":
+        """Builds the columns from a repeated field of decoded protobuf events."""
+        encoded = [event.SerializeToString() for event in events]
+        offsets = array("Q", [0])
+        offsets.extend(accumulate(map(len, encoded)))
+        return cls(
+            array("q", [event.creation_day for event in events]),
+            [event.signature for event in events],
+            b"".join(encoded),
+            offsets,
+        )
+
+    def event_bytes(self, index: int) -> memoryview:
+        """Returns a zero-copy view of the wire encoding of one event, e.g. for a Merkle leaf."""
+        return memoryview(self.wire)[self.offsets[index]:self.offsets[index + 1]]
+
+    def __len__(self) -> int:
+        return len(self.sigs)
+
+    def __getitem__(self, index: int) -> Event:
+        return Event(creation_day=self.creation_days[index], sig=self.sigs[index])
+
+    def __iter__(self) -> Iterator[Event]:
+        for creation_day, sig in zip(self.creation_days, self.sigs):
+            yield Event(creation_day=creation_day, sig=sig)
+
 # --- Message Types ---
 
-@dataclass
-class Message:
+@dataclass(frozen=True, slots=True)
+class Message(CachedDictMixin):
     """Base class for all messages exchanged in the Conductor network."""
     epoch: int
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class RBCPropose(Message):
     """Reliable Broadcast Propose message."""
     proposer_id: str
-    payload_hash: str
+    payload_hash: bytes  # Raw 32-byte BLAKE3 digest
     enc_chunks: List[EncryptedShare]  # Encrypted erasure-coded fragments
     k: int  # Threshold parameter k
     n: int  # Total number of participants n
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class EncShare(Message):
     """Encrypted payload share message."""
     enc_payload_share: EncryptedShare
     proposer_id: str
     chunk_index: int
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class CoinShare(Message):
     """Common Coin share message."""
     coin_sig_share: ThresholdSignature
     proposer_id: str
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Commit(Message):
     """Commit message for an epoch block."""
     block_digest: str
     quorum_cert: str
 
-@dataclass
-class QuorumCertificate:
-    """Represents a cryptographic quorum certificate for a block or day proof."""
-    epoch_or_day: int
-    payload_hash: str # Hash of the data being certified (e.g., block hash, day proof hash)
-    signatures: Dict[str, str] # Dictionary of validator_id -> signature_share
-    aggregated_signature: Optional[str] = None # The combined signature once enough shares are collected
-
-@dataclass
+@dataclass(frozen=True, slots=True)
 class MembershipChangeMessage(Message):
     """Message for propagating membership changes."""
     update: MembershipChange
     quorum_cert: str
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class BlacklistVote(Message):
     """Represents a vote to blacklist a validator."""
     voter_id: str
@@ -1,18 +1,124 @@
 """Network layer implementation using libp2p for Conductor."""
 
 import asyncio
+import contextvars
 import logging
-from typing import List, Dict, Optional, Callable, Any
+import struct
+from array import array
+from typing import List, Dict, Optional, Callable, Any, Set
 from dataclasses import dataclass
-import json
 import time
 
+import orjson
+
+from conductor.hashing import blake3_digest
+from conductor.models import EncryptedShare, RBCPropose
+
 # Note: In a real implementation, you would use py-libp2p
 # For now, we'll create a simulation that can be replaced with real libp2p
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+# Peer and message timestamps are only compared with each other, so they use
+# the cheaper monotonic clock, which also cannot jump with wall-clock changes.
+_monotonic = time.monotonic
+
+# Upper bound on message handlers running at once in the processing loop.
+MAX_CONCURRENT_HANDLERS = 64
+
+# Topic and sending peer of the message being handled, visible to handlers,
+# logging and metrics without threading them through every call.
+current_topic: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("current_topic", default=None)
+current_peer: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("current_peer", default=None)
+
+# Peer ids are derived from a truncated BLAKE3 digest of the peer address.
+PEER_ID_BYTES = 8
+
+
+def json_default(obj: Any) -> Any:
+    """orjson fallback for types it does not serialize natively."""
+    if isinstance(obj, (bytes, bytearray, memoryview)):
+        return bytes(obj).hex()
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+# Binary RBCPropose frames start with a tag byte no JSON document can begin with.
+_RBC_PROPOSE_TAG = b"\x01"
+_RBC_PROPOSE_HEADER = struct.Struct("<QIII")  # epoch, k, n, chunk count
+_RBC_CHUNK_HEADER = struct.Struct("<II")  # share_id, data length
+
+
+def encode_rbc_propose(message: RBCPropose) -> bytes:
+    """Encode an RBCPropose as a length-prefixed binary frame.
+
+    Encrypted chunks are carried as raw bytes rather than hex text, which
+    halves their size on the wire and skips per-byte string escaping.
+    """
+    proposer_id = message.proposer_id.encode()
+    parts = [
+        _RBC_PROPOSE_TAG,
+        _RBC_PROPOSE_HEADER.pack(message.epoch, message.k, message.n, len(message.enc_chunks)),
+        struct.pack("<H", len(proposer_id)),
+        proposer_id,
+        struct.pack("<H", len(message.payload_hash)),
+        message.payload_hash,
+    ]
+    pack_chunk = _RBC_CHUNK_HEADER.pack
+    for chunk in message.enc_chunks:
+        parts.append(pack_chunk(chunk.share_id, len(chunk.data)))
+        parts.append(chunk.data)
+    return b"".join(parts)
+
+
+def decode_rbc_propose(data: bytes) -> RBCPropose:
+    """Decode a frame produced by encode_rbc_propose."""
+    view = memoryview(data)
+    offset = len(_RBC_PROPOSE_TAG)
+    epoch, k, n, count = _RBC_PROPOSE_HEADER.unpack_from(view, offset)
+    offset += _RBC_PROPOSE_HEADER.size
+    (size,) = struct.unpack_from("<H", view, offset)
+    offset += 2
+    proposer_id = bytes(view[offset:offset + size]).decode()
+    offset += size
+    (size,) = struct.unpack_from("<H", view, offset)
+    offset += 2
+    payload_hash = bytes(view[offset:offset + size])
+    offset += size
+    enc_chunks = []
+    unpack_chunk = _RBC_CHUNK_HEADER.unpack_from
+    for _ in range(count):
+        share_id, size = unpack_chunk(view, offset)
+        offset += _RBC_CHUNK_HEADER.size
+        enc_chunks.append(EncryptedShare(share_id=share_id, data=bytes(view[offset:offset + size])))
+        offset += size
+    if offset != len(view):
+        raise ValueError("Trailing bytes after RBCPropose frame")
+    return RBCPropose(
+        epoch=epoch, proposer_id=proposer_id, payload_hash=payload_hash,
+        enc_chunks=enc_chunks, k=k, n=n,
+    )
+
+
+def encode_message(message: Any) -> bytes:
+    """Encode a message (dict, list or models dataclass) for the wire.
+
+    RBCPropose uses the binary frame from encode_rbc_propose; everything
+    else is JSON. orjson serializes dataclasses natively and returns bytes,
+    so there is no asdict() copy and no str.encode() pass; byte fields are
+    hex-encoded.
+    """
+    if isinstance(message, RBCPropose):
+        return encode_rbc_propose(message)
+    return orjson.dumps(message, default=json_default)
+
+
+def decode_message(data: bytes) -> Any:
+    """Decode message bytes produced by encode_message."""
+    if data[:1] == _RBC_PROPOSE_TAG:
+        return decode_rbc_propose(data)
+    return orjson.loads(data)
+
+@dataclass(slots=True)
 class PeerInfo:
     """Information about a peer in the network."""
     peer_id: str
@@ -41,12 +147,19 @@ class Libp2pNetwork:
         self.peers: Dict[str, PeerInfo] = {}
         self.connected_peers: Dict[str, PeerInfo] = {}
         self.message_handlers: Dict[str, Callable] = {}
+        # Last-seen times kept column-wise, one slot per peer ever connected, so
+        # liveness sweeps scan a packed array of doubles instead of PeerInfo objects
+        self._peer_index: Dict[str, int] = {}
+        self._peer_ids: List[str] = []
+        self._last_seen = array("d")
         
         # GossipSub simulation
-        self.gossip_topics: Dict[str, List[str]] = {}  # topic -> list of subscribers
-        self.message_queue: List[Dict] = []
+        self.gossip_topics: Dict[str, Set[str]] = {}  # topic -> subscriber IDs
+        self.message_queue: "asyncio.Queue[Dict]" = asyncio.Queue()  # Binds to the running loop on first use
+        self._processing_task: Optional[asyncio.Task] = None
+        self._handler_slots = asyncio.Semaphore(MAX_CONCURRENT_HANDLERS)
         
-        logger.info(f"Initialized Libp2pNetwork with address {listen_address}")
+        logger.info("Initialized Libp2pNetwork with address %s", listen_address)
 
     async def start(self):
         """Start the network layer."""
@@ -60,13 +173,21 @@ class Libp2pNetwork:
             await self._connect_to_peer(peer_addr)
             
         # Start message processing loop
-        asyncio.create_task(self._message_processing_loop())
+        self._processing_task = asyncio.create_task(self._message_processing_loop())
         
         logger.info("Network started successfully")
 
     async def stop(self):
         """Stop the network layer."""
         logger.info("Stopping network...")
+        if self._processing_task is not None:
+            # Cancelling the loop cancels its TaskGroup's handlers; wait for them to unwind
+            self._processing_task.cancel()
+            try:
+                await self._processing_task
+            except asyncio.CancelledError:
+                pass
+            self._processing_task = None
         # Disconnect from all peers
         for peer_id in list(self.connected_peers.keys()):
             await self._disconnect_peer(peer_id)
@@ -76,23 +197,25 @@ class Libp2pNetwork:
         """Connect to a peer."""
         try:
             # Simulate connection
-            peer_id = f"peer_{hash(peer_addr) % 10000}"
+            # Stable across restarts, unlike the per-process randomised hash()
+            peer_id = f"peer_{blake3_digest(peer_addr)[:PEER_ID_BYTES].hex()}"
             peer_info = PeerInfo(
                 peer_id=peer_id,
                 address=peer_addr,
                 public_key=b"fake_public_key",
-                last_seen=time.time(),
+                last_seen=_monotonic(),
                 is_connected=True
             )
             
             self.peers[peer_id] = peer_info
             self.connected_peers[peer_id] = peer_info
+            self._set_last_seen(peer_id, peer_info.last_seen)
             
-            logger.info(f"Connected to peer {peer_id} at {peer_addr}")
+            logger.info("Connected to peer %s at %s", peer_id, peer_addr)
             return True
             
         except Exception as e:
-            logger.error(f"Failed to connect to peer {peer_addr}: {e}")
+            logger.error("Failed to connect to peer %s: %s", peer_addr, e)
             return False
 
     async def _disconnect_peer(self, peer_id: str):
@@ -100,55 +223,93 @@ class Libp2pNetwork:
         if peer_id in self.connected_peers:
             self.connected_peers[peer_id].is_connected = False
             del self.connected_peers[peer_id]
-            logger.info(f"Disconnected from peer {peer_id}")
+            logger.info("Disconnected from peer %s", peer_id)
+
+    def _set_last_seen(self, peer_id: str, timestamp: float) -> None:
+        slot = self._peer_index.get(peer_id)
+        if slot is None:
+            self._peer_index[peer_id] = len(self._peer_ids)
+            self._peer_ids.append(peer_id)
+            self._last_seen.append(timestamp)
+        else:
+            self._last_seen[slot] = timestamp
+
+    def mark_peer_seen(self, peer_id: str) -> None:
+        """Record that a peer was just heard from."""
+        now = _monotonic()
+        self._set_last_seen(peer_id, now)
+        peer_info = self.peers.get(peer_id)
+        if peer_info is not None:
+            peer_info.last_seen = now
+
+    async def disconnect_stale_peers(self, timeout: float) -> List[str]:
+        """
+        Disconnect connected peers not heard from within timeout seconds.
+        
+        Args:
+            timeout: Maximum silence in seconds
+            
+        Returns:
+            IDs of the peers that were disconnected
+        """
+        cutoff = _monotonic() - timeout
+        peer_ids = self._peer_ids
+        stale = [peer_ids[slot] for slot, seen in enumerate(self._last_seen) if seen < cutoff]
+        stale = [peer_id for peer_id in stale if peer_id in self.connected_peers]
+        for peer_id in stale:
+            await self._disconnect_peer(peer_id)
+        return stale
 
-    async def broadcast_message(self, message: bytes, topic: str = "default"):
+    async def broadcast_message(self, message: Any, topic: str = "default"):
         """
         Broadcast message to all connected peers.
         
         Args:
-            message: Message to broadcast
+            message: Message to broadcast; anything but bytes is JSON-encoded
             topic: Gossip topic
         """
-        if topic not in self.gossip_topics:
-            self.gossip_topics[topic] = []
+        if not isinstance(message, (bytes, bytearray)):
+            message = encode_message(message)
+        self.gossip_topics.setdefault(topic, set())
             
         # Add to message queue for processing
-        self.message_queue.append({
+        self.message_queue.put_nowait({
             'type': 'broadcast',
             'topic': topic,
             'message': message,
             'sender': self.node_id,
-            'timestamp': time.time()
+            'timestamp': _monotonic()
         })
         
-        logger.debug(f"Broadcasted message to topic {topic}")
+        logger.debug("Broadcasted message to topic %s", topic)
 
-    async def send_direct(self, peer_id: str, message: bytes) -> bool:
+    async def send_direct(self, peer_id: str, message: Any) -> bool:
         """
         Send direct message to specific peer.
         
         Args:
             peer_id: Target peer ID
-            message: Message to send
+            message: Message to send; anything but bytes is JSON-encoded
             
         Returns:
             True if message was sent successfully
         """
         if peer_id not in self.connected_peers:
-            logger.warning(f"Peer {peer_id} not connected")
+            logger.warning("Peer %s not connected", peer_id)
             return False
+        if not isinstance(message, (bytes, bytearray)):
+            message = encode_message(message)
             
         # Add to message queue
-        self.message_queue.append({
+        self.message_queue.put_nowait({
             'type': 'direct',
             'peer_id': peer_id,
             'message': message,
             'sender': self.node_id,
-            'timestamp': time.time()
+            'timestamp': _monotonic()
         })
         
-        logger.debug(f"Sent direct message to peer {peer_id}")
+        logger.debug("Sent direct message to peer %s", peer_id)
         return True
 
     async def subscribe_topic(self, topic: str, handler: Callable):
@@ -159,22 +320,31 @@ class Libp2pNetwork:
             topic: Topic to subscribe to
             handler: Message handler function
         """
-        if topic not in self.gossip_topics:
-            self.gossip_topics[topic] = []
-            
-        self.gossip_topics[topic].append(self.node_id)
+        self.gossip_topics.setdefault(topic, set()).add(self.node_id)
         self.message_handlers[topic] = handler
         
-        logger.info(f"Subscribed to topic {topic}")
+        logger.info("Subscribed to topic %s", topic)
 
     async def _message_processing_loop(self):
-        """Process incoming messages."""
-        while True:
-            if self.message_queue:
-                message = self.message_queue.pop(0)
-                await self._handle_message(message)
-            else:
-                await asyncio.sleep(0.01)  # Small delay to prevent busy waiting
+        """Process incoming messages, each in its own task.
+
+        A slow handler on one topic no longer holds up the others. Waiting for
+        a free handler slot before dequeuing the next message keeps the number
+        of in-flight tasks bounded.
+        """
+        async with asyncio.TaskGroup() as tg:
+            while True:
+                message = await self.message_queue.get()  # Suspends until a message is queued
+                await self._handler_slots.acquire()
+                tg.create_task(self._dispatch_message(message))
+
+    async def _dispatch_message(self, message: Dict):
+        """Handle one queued message, then free its handler slot."""
+        try:
+            await self._handle_message(message)
+        finally:
+            self._handler_slots.release()
+            self.message_queue.task_done()
 
     async def _handle_message(self, message: Dict):
         """Handle incoming message."""
@@ -184,21 +354,24 @@ class Libp2pNetwork:
             elif message['type'] == 'direct':
                 await self._handle_direct_message(message)
         except Exception as e:
-            logger.error(f"Error handling message: {e}")
+            logger.error("Error handling message: %s", e)
 
     async def _handle_broadcast_message(self, message: Dict):
         """Handle broadcast message."""
         topic = message['topic']
+        current_topic.set(topic)  # Scoped to this message's task
+        current_peer.set(message.get('sender'))
         if topic in self.message_handlers:
             try:
                 await self.message_handlers[topic](message['message'])
             except Exception as e:
-                logger.error(f"Error in message handler for topic {topic}: {e}")
+                logger.error("Error in message handler for topic %s: %s", topic, e)
 
     async def _handle_direct_message(self, message: Dict):
         """Handle direct message."""
         # In a real implementation, this would route to the appropriate handler
-        logger.debug(f"Received direct message from {message['sender']}")
+        current_peer.set(message['sender'])
+        logger.debug("Received direct message from %s", message['sender'])
 
     async def request_fragment(self, peer_id: str, batch_id: str, fragment_index: int) -> Optional[bytes]:
         """
@@ -213,7 +386,7 @@ class Libp2pNetwork:
             Fragment data or None if not available
         """
         # Simulate fragment request
-        logger.debug(f"Requesting fragment {fragment_index} for batch {batch_id} from peer {peer_id}")
+        logger.debug("Requesting fragment %s for batch %s from peer %s", fragment_index, batch_id, peer_id)
         
         # In a real implementation, this would send a request and wait for response
         await asyncio.sleep(0.01)  # Simulate network delay
@@ -1,22 +1,21 @@
 import asyncio
-import json
+import bisect
 import logging
-import pickle
+import math
+import struct
 import time
-from collections import defaultdict
-from dataclasses import asdict, dataclass
+from array import array
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass, replace
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, List, Optional, Set
+from operator import itemgetter
+from typing import Any, Dict, List, Optional, Set, Tuple
 
-import nacl.signing
 import lmdb
-import grpc.aio # Added
+import orjson
 import concurrent.futures # Added
 import random # Added
 
-import conductor_pb2
-import conductor_pb2_grpc
-
 from conductor.vdf import (
     GENESIS_SEED,
     GENESIS_TIMESTAMP,
@@ -32,6 +31,7 @@ from conductor.models import (
     ConsensusError,
     DayProof,
     EncShare,
+    EncryptedShare,
     Event,
     MembershipChange,
     MembershipChangeMessage,
@@ -43,78 +43,414 @@ from conductor.models import (
     EventBatch,
     BlacklistVote,
     QuorumCertificate,
+    ThresholdSignature,
 )
 from conductor.config import Config, load_config # Added
-from conductor.hashing import blake3_hash
+from conductor import ed25519
+from conductor.hashing import blake3_digest, blake3_hash, blake3_hasher
 from conductor.crypto import ThresholdCrypto # Added
+from conductor.network import json_default
 
 # Setup logging
 logger = logging.getLogger(__name__)
 
+# Distinct (day, proof) verification outcomes remembered by ConsensusModule;
+# peers rebroadcast the same proofs while a quorum forms.
+VDF_VERIFY_CACHE_SIZE = 1024
+
+# Day numbers ValidatorStorage remembers having stored, so has_proof can
+# answer the common "already have day N" check without an LMDB transaction.
+KNOWN_DAYS_CACHE_SIZE = 4096
+
+# Decoded DayProofs ValidatorStorage keeps in memory; consensus rounds read the
+# same recent days repeatedly.
+PROOF_CACHE_SIZE = 1024
+
+# Stored proof records: a version byte, then the fixed header, the three byte
+# fields back to back and, if present, the quorum certificate as JSON.
+PROOF_RECORD_VERSION = 1
+_PROOF_RECORD_HEADER = struct.Struct("<BqIII")  # version, day_number, proof/validator_id/signature lengths
+
+
 # --- Storage Layer ---
 class ValidatorStorage:
     """Persistent storage for validator node using LMDB."""
 
-    def __init__(self, path: str):
+    def __init__(self, path: str, sync: bool = True):
         # max_dbs=0 means no named databases are supported, use the default unnamed database.
-        self.env = lmdb.open(path, map_size=10*1024*1024*1024, max_dbs=0, sync=True)
+        # writemap writes pages straight into the shared mapping instead of via
+        # write(), and metasync=False skips the second fsync of the meta page per
+        # commit: a crash can lose the last commits but never corrupts the store.
+        # With sync=False, map_async flushes the mapping asynchronously.
+        self.env = lmdb.open(
+            path,
+            map_size=10*1024*1024*1024,
+            max_dbs=0,
+            sync=sync,
+            metasync=False,
+            writemap=True,
+            map_async=True,
+        )
+        # One thread owns every LMDB call, keeping transactions off the event
+        # loop and write transactions from contending for the writer lock
+        self._io = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="lmdb")
+        self.batcher = CommitBatcher(self.env, executor=self._io)
+        self._known_days: "OrderedDict[int, None]" = OrderedDict()  # Recently stored or seen days, oldest first
+        self._proof_cache: "OrderedDict[int, DayProof]" = OrderedDict()  # day_number -> proof, least recently used first
+        self.version = 0  # Bumped after every committed write, so readers can drop derived caches
         logger.info(f"Initialized LMDB at {path}")
 
     async def save_proof(self, proof: DayProof):
-        """Store proof in local database."""
-        key = f"proof:day:{proof.day_number}".encode()
-        value = self._serialize(proof)
-        with self.env.begin(write=True) as txn:
-            txn.put(key, value)
+        """Store proof in local database, group-committed with other concurrent writes."""
+        await self.batcher.submit(self._proof_key(proof.day_number), self._serialize(proof))
+        self._remember_day(proof.day_number)
+        self._cache_proof(proof)
+        self.version += 1
         logger.debug(f"Saved proof for day {proof.day_number}")
 
+    async def save_proofs(self, proofs: List[DayProof]):
+        """Store many proofs in one transaction, e.g. when syncing history."""
+        await self.batcher.submit_many([(self._proof_key(proof.day_number), self._serialize(proof)) for proof in proofs])
+        for proof in proofs:
+            self._remember_day(proof.day_number)
+            self._cache_proof(proof)
+        self.version += 1
+        logger.debug(f"Saved {len(proofs)} proofs")
+
+    async def flush_now(self):
+        """Commit every queued write immediately, e.g. on shutdown."""
+        await self.batcher.flush_now()
+
+    async def close(self):
+        """Commit pending writes, stop the LMDB thread and close the environment."""
+        await self.batcher.close()
+        # The batcher has drained, so this only waits for the idle thread to exit
+        await asyncio.get_running_loop().run_in_executor(None, self._io.shutdown)
+        self.env.close()
+
+    def _read(self, key: bytes) -> Optional[bytes]:
+        """Read one value in a short transaction; runs on the LMDB thread."""
+        with self.env.begin() as txn:
+            return txn.get(key)
+
+    async def _get(self, key: bytes) -> Optional[bytes]:
+        return await asyncio.get_running_loop().run_in_executor(self._io, self._read, key)
+
+    @staticmethod
+    def _proof_key(day_number: int) -> bytes:
+        return f"proof:day:{day_number}".encode()
+
     async def get_proof(self, day_number: int) -> Optional[DayProof]:
         """Retrieve proof from local database."""
-        key = f"proof:day:{day_number}".encode()
-        with self.env.begin() as txn:
-            value = txn.get(key)
+        cached = self._proof_cache.get(day_number)
+        if cached is not None:
+            self._proof_cache.move_to_end(day_number)
+            return cached
+        value = await self._get(self._proof_key(day_number))
         if value:
             logger.debug(f"Retrieved proof for day {day_number}")
-            return self._deserialize(value)
+            proof = self._deserialize(value)
+            self._cache_proof(proof)
+            return proof
         logger.debug(f"No proof found for day {day_number}")
         return None
 
     async def has_proof(self, day_number: int) -> bool:
         """Check if proof exists locally."""
-        key = f"proof:day:{proof.day_number}".encode()
-        with self.env.begin() as txn:
-            return txn.get(key) is not None
+        if day_number in self._known_days:
+            return True
+        found = await self._get(self._proof_key(day_number)) is not None
+        if found:
+            self._remember_day(day_number)
+        return found
+
+    def _remember_day(self, day_number: int):
+        """Record a stored day, evicting the oldest once the cache is full."""
+        self._known_days[day_number] = None
+        self._known_days.move_to_end(day_number)
+        if len(self._known_days) > KNOWN_DAYS_CACHE_SIZE:
+            self._known_days.popitem(last=False)
+
+    def _cache_proof(self, proof: DayProof):
+        """Keep a decoded proof in memory, evicting the least recently used."""
+        self._proof_cache[proof.day_number] = proof
+        self._proof_cache.move_to_end(proof.day_number)
+        if len(self._proof_cache) > PROOF_CACHE_SIZE:
+            self._proof_cache.popitem(last=False)
 
     def _serialize(self, proof: DayProof) -> bytes:
         """Serialize proof for storage."""
-        return pickle.dumps(proof)
+        header = _PROOF_RECORD_HEADER.pack(
+            PROOF_RECORD_VERSION, proof.day_number, len(proof.proof), len(proof.validator_id), len(proof.signature)
+        )
+        quorum_cert = orjson.dumps(proof.quorum_cert) if proof.quorum_cert is not None else b""
+        return b"".join((header, proof.proof, proof.validator_id, proof.signature, quorum_cert))
 
     def _deserialize(self, data: bytes) -> DayProof:
         """Deserialize proof from storage."""
-        return pickle.loads(data)
+        if data[0] != PROOF_RECORD_VERSION:
+            raise ValueError(f"Unsupported proof record version {data[0]}")
+        _, day_number, proof_len, validator_id_len, signature_len = _PROOF_RECORD_HEADER.unpack_from(data)
+        view = memoryview(data)
+        start = _PROOF_RECORD_HEADER.size
+        fields = []
+        for length in (proof_len, validator_id_len, signature_len):
+            fields.append(bytes(view[start:start + length]))
+            start += length
+        quorum_cert = QuorumCertificate(**orjson.loads(view[start:])) if start < len(data) else None
+        return DayProof(day_number, *fields, quorum_cert=quorum_cert)
+
+    async def save_block(self, epoch: int, block: Dict[str, Any]):
+        """Store a committed block, group-committed with other concurrent writes."""
+        key = f"block:epoch:{epoch}".encode()
+        await self.batcher.submit(key, orjson.dumps(block, default=json_default))
+        self.version += 1
+        logger.debug(f"Saved block for epoch {epoch}")
+
+    async def get_block(self, epoch: int) -> Optional[Dict[str, Any]]:
+        """Retrieve a committed block from local database."""
+        key = f"block:epoch:{epoch}".encode()
+        value = await self._get(key)
+        return orjson.loads(value) if value else None
+
+
+class CommitBatcher:
+    """Group-commits LMDB writes.
+
+    Writers enqueue (key, value) pairs and await a future. A background task
+    collects whatever arrives within commit_interval_ms (up to max_batch items),
+    writes it in a single transaction, and then resolves every waiter, so a burst
+    of commits pays for one sync instead of one each. Transactions run on a
+    single-thread executor, so they commit in submission order and never block
+    the event loop.
+    """
+
+    def __init__(
+        self,
+        env: lmdb.Environment,
+        commit_interval_ms: float = 2.0,
+        max_batch: int = 1000,
+        executor: Optional[concurrent.futures.ThreadPoolExecutor] = None,
+    ):
+        self.env = env
+        self.commit_interval = commit_interval_ms / 1000
+        self.max_batch = max_batch
+        self._executor = executor or concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="lmdb")
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._pending: List[Tuple[bytes, bytes, asyncio.Future]] = []  # Dequeued, waiting out the interval
+        self._in_flight: Optional[asyncio.Task] = None  # Commit of the batch being written
+
+    async def submit(self, key: bytes, value: bytes) -> None:
+        """Queues a write and waits until its transaction has been committed."""
+        await self.submit_many([(key, value)])
+
+    async def submit_many(self, items: List[Tuple[bytes, bytes]]) -> None:
+        """Queues several writes together and waits until all are committed.
+
+        The items are queued back to back, so they share a transaction unless
+        they exceed max_batch.
+        """
+        if not items:
+            return
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+        if self._task is None or self._task.done():
+            # Restart on the same queue so writes queued before a stop are kept
+            self._task = asyncio.create_task(self._run())
+        loop = asyncio.get_running_loop()
+        futures = []
+        for key, value in items:
+            future = loop.create_future()
+            self._queue.put_nowait((key, value, future))
+            futures.append(future)
+        await asyncio.gather(*futures)
+
+    async def _run(self):
+        queue = self._queue
+        while True:
+            self._pending.append(await queue.get())
+            await asyncio.sleep(self.commit_interval)
+            self._in_flight = asyncio.create_task(self._commit(self._take(queue)))
+            # Shielded so cancelling the writer never strands a batch mid-commit
+            await asyncio.shield(self._in_flight)
+
+    def _take(self, queue: asyncio.Queue) -> List[Tuple[bytes, bytes, asyncio.Future]]:
+        """Returns the held write plus whatever else is queued, up to max_batch."""
+        batch, self._pending = self._pending, []
+        while len(batch) < self.max_batch and not queue.empty():
+            batch.append(queue.get_nowait())
+        return batch
+
+    def _write(self, batch: List[Tuple[bytes, bytes, asyncio.Future]]):
+        """Writes a batch in a single transaction; runs on the executor thread."""
+        with self.env.begin(write=True) as txn:
+            for key, value, _ in batch:
+                txn.put(key, value)
+
+    async def _commit(self, batch: List[Tuple[bytes, bytes, asyncio.Future]]):
+        """Writes a batch off the event loop and resolves its waiters."""
+        if not batch:
+            return
+        try:
+            await asyncio.get_running_loop().run_in_executor(self._executor, self._write, batch)
+        except Exception as e:
+            self._resolve(batch, e)
+        else:
+            self._resolve(batch, None)
+
+    @staticmethod
+    def _resolve(batch: List[Tuple[bytes, bytes, asyncio.Future]], error: Optional[Exception]):
+        for _, _, future in batch:
+            if not future.done():
+                if error is None:
+                    future.set_result(None)
+                else:
+                    future.set_exception(error)
+
+    async def flush_now(self):
+        """Commits every pending write now instead of waiting out the interval.
+
+        The single-thread executor orders these commits after any batch already
+        in flight.
+        """
+        queue = self._queue
+        if queue is None:
+            return
+        loop = asyncio.get_running_loop()
+        while self._pending or not queue.empty():
+            batch = self._take(queue)
+            try:
+                await loop.run_in_executor(self._executor, self._write, batch)
+            except Exception as e:
+                self._resolve(batch, e)
+            else:
+                self._resolve(batch, None)
+
+    async def close(self):
+        """Commits pending writes and stops the background writer."""
+        await self.flush_now()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._in_flight is not None:
+            await self._in_flight
+            self._in_flight = None
 
 
 # --- DHT Network Layer (Placeholder) ---
+class PeerRegistry:
+    """Shared table of the simulated DHT nodes, indexed by position.
+
+    Every DHTNetwork in a simulated network registers here once, instead of each
+    node holding its own list of references to every other node.
+    """
+
+    def __init__(self):
+        self.ids: List[bytes] = []  # position -> validator public key
+        self.members: List["DHTNetwork"] = []  # position -> DHTNetwork instance
+        self.positions: Dict[bytes, int] = {}  # validator public key -> position
+
+    def register(self, validator_id: bytes, member: "DHTNetwork") -> int:
+        """Adds a node to the registry and returns its position."""
+        index = self.positions.get(validator_id)
+        if index is not None:
+            self.members[index] = member
+            return index
+        index = len(self.ids)
+        self.ids.append(validator_id)
+        self.members.append(member)
+        self.positions[validator_id] = index
+        return index
+
+    def others(self, index: int) -> List["DHTNetwork"]:
+        """Returns every registered node except the one at index."""
+        members = self.members
+        return members[:index] + members[index + 1:]
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+
+class ProofDayTable:
+    """One day's DHT proofs and VDF completion times, stored column-wise.
+
+    Validator ids are kept sorted, so finding a validator is a bisect rather
+    than a hash of a 32-byte key, and each validator's proof and completion
+    time sit at the same position in parallel columns. A slot is created by
+    whichever arrives first; a missing proof is None and a missing time NaN.
+    """
+    __slots__ = ("ids", "proofs", "times")
+
+    def __init__(self):
+        self.ids: List[bytes] = []  # Sorted validator public keys
+        self.proofs: List[Optional[DayProof]] = []
+        self.times = array("d")  # Completion time in seconds, NaN if unknown
+
+    def _slot(self, validator_id: bytes) -> int:
+        """Returns the validator's position, inserting an empty slot if needed."""
+        ids = self.ids
+        index = bisect.bisect_left(ids, validator_id)
+        if index == len(ids) or ids[index] != validator_id:
+            ids.insert(index, validator_id)
+            self.proofs.insert(index, None)
+            self.times.insert(index, math.nan)
+        return index
+
+    def set_proof(self, proof: DayProof):
+        self.proofs[self._slot(proof.validator_id)] = proof
+
+    def set_time(self, validator_id: bytes, completion_time_seconds: float):
+        self.times[self._slot(validator_id)] = completion_time_seconds
+
+    def proofs_by_validator(self) -> Dict[bytes, DayProof]:
+        """Returns validator id -> proof for every validator with a proof."""
+        return {validator_id: proof for validator_id, proof in zip(self.ids, self.proofs) if proof is not None}
+
+    def completion_times(self) -> List[float]:
+        """Returns the known completion times, in validator id order."""
+        return [t for t in self.times if not math.isnan(t)]
+
+
 class DHTNetwork:
     """Distributed Hash Table for proof storage and discovery (Simulated)."""
 
-    def __init__(self, bootstrap_peers: List[str], keypair: tuple, validator_node_instance: "ValidatorNode" = None, peers: List["DHTNetwork"] = None):
+    def __init__(self, bootstrap_peers: List[str], keypair: tuple, validator_node_instance: "ValidatorNode" = None, registry: Optional[PeerRegistry] = None):
         self.bootstrap_peers = bootstrap_peers
         self.keypair = keypair
         self.validator_node_instance = validator_node_instance # Store the ValidatorNode instance
         self.node = None
-        self.peers = peers if peers is not None else [] # References to other DHTNetwork instances
+        # Simulated peers are the other members of a shared registry
+        self.registry = registry if registry is not None else PeerRegistry()
+        self.index = self.registry.register(keypair[1], self)
 
         # Instance-level storage for proofs and completion times
-        self._proofs: Dict[int, Dict[bytes, DayProof]] = defaultdict(dict) # day_number -> validator_id (pubkey bytes) -> DayProof
+        self._days: Dict[int, ProofDayTable] = defaultdict(ProofDayTable) # day_number -> proofs and completion times by validator
         self._canonical_proofs: Dict[int, DayProof] = {}
-        self._vdf_completion_times: Dict[int, Dict[bytes, float]] = defaultdict(dict) # day_number -> validator_id (pubkey bytes) -> completion_time_seconds
 
         logger.info(f"Initialized DHTNetwork with {len(bootstrap_peers)} bootstrap peers and {len(self.peers)} simulated peers")
-        self.bootstrap_peers = bootstrap_peers
-        self.keypair = keypair
-        self.node = None
-        logger.info(f"Initialized DHTNetwork with {len(bootstrap_peers)} bootstrap peers")
+
+    @property
+    def peers(self) -> List["DHTNetwork"]:
+        """Other DHTNetwork instances in the simulated network."""
+        return self.registry.others(self.index)
+
+    async def _gather_peers(self, calls: List[Any]) -> List[Any]:
+        """Awaits one call per peer concurrently, in peer order.
+
+        A peer that raises is logged and yields None instead of aborting the
+        fan-out to the remaining peers.
+        """
+        results = await asyncio.gather(*calls, return_exceptions=True)
+        for i, result in enumerate(results):
+            if isinstance(result, BaseException):
+                logger.warning(f"DHT peer call failed: {result!r}")
+                results[i] = None
+        return results
 
     async def initialize(self):
         """Initialize the simulated DHT network."""
@@ -125,9 +461,8 @@ class DHTNetwork:
     async def publish_proof(self, proof: DayProof):
         """Publish day proof to DHT (Simulated)."""
         logger.info(f"Publishing proof for day {proof.day_number} from {proof.validator_id.hex()} to DHT (simulated)...")
-        self._proofs[proof.day_number][proof.validator_id] = proof # Store locally
-        for peer in self.peers:
-            await peer.handle_published_proof(proof)
+        self._days[proof.day_number].set_proof(proof) # Store locally
+        await self._gather_peers([peer.handle_published_proof(proof) for peer in self.peers])
         await asyncio.sleep(0.05)  # Simulate async operation
 
     async def fetch_proof(self, day_number: int) -> Optional[DayProof]:
@@ -138,9 +473,9 @@ class DHTNetwork:
         if local_proof:
             return local_proof
 
-        # If not found locally, ask peers
-        for peer in self.peers:
-            peer_proof = await peer.get_canonical_proof(day_number)
+        # If not found locally, ask all peers at once and take the first answer in peer order
+        peer_proofs = await self._gather_peers([peer.get_canonical_proof(day_number) for peer in self.peers])
+        for peer_proof in peer_proofs:
             if peer_proof:
                 self._canonical_proofs[day_number] = peer_proof # Store locally for future use
                 return peer_proof
@@ -155,14 +490,14 @@ class DHTNetwork:
         all_proofs_for_day = {local_proof.validator_id: local_proof} # Start with local proof
 
         # Collect proofs from local store
-        for validator_id, proof in self._proofs[day_number].items():
-            all_proofs_for_day[validator_id] = proof
+        table = self._days.get(day_number)
+        if table is not None:
+            all_proofs_for_day.update(table.proofs_by_validator())
 
-        # Collect proofs from peers
-        for peer in self.peers:
-            peer_proofs = await peer.get_proof_for_day(day_number)
-            for validator_id, proof in peer_proofs.items():
-                all_proofs_for_day[validator_id] = proof
+        # Collect proofs from peers concurrently, merging in peer order
+        for peer_proofs in await self._gather_peers([peer.get_proof_for_day(day_number) for peer in self.peers]):
+            if peer_proofs:
+                all_proofs_for_day.update(peer_proofs)
 
         return list(all_proofs_for_day.values())
 
@@ -170,21 +505,21 @@ class DHTNetwork:
         """Publish canonical proof to DHT (Simulated)."""
         logger.info(f"Publishing canonical proof for day {day_number} from {canonical_proof.validator_id.hex()} to DHT (simulated)...")
         self._canonical_proofs[day_number] = canonical_proof # Store locally
-        for peer in self.peers:
-            await peer.handle_canonical_proof(canonical_proof, day_number)
+        await self._gather_peers([peer.handle_canonical_proof(canonical_proof, day_number) for peer in self.peers])
         await asyncio.sleep(0.05)  # Simulate async operation
 
     async def publish_vdf_completion_time(self, day_number: int, validator_id: bytes, completion_time_seconds: float):
         """Publish VDF completion time to DHT (Simulated)."""
         logger.info(f"Publishing VDF completion time for day {day_number} from {validator_id.hex()}: {completion_time_seconds:.2f}s (simulated)...")
-        self._vdf_completion_times[day_number][validator_id] = completion_time_seconds
-        for peer in self.peers:
-            await peer.handle_vdf_completion_time(day_number, validator_id, completion_time_seconds)
+        self._days[day_number].set_time(validator_id, completion_time_seconds)
+        await self._gather_peers([
+            peer.handle_vdf_completion_time(day_number, validator_id, completion_time_seconds) for peer in self.peers
+        ])
         await asyncio.sleep(0.05)  # Simulate async operation
 
     async def handle_published_proof(self, proof: DayProof):
         """Handle a published proof from a peer."""
-        self._proofs[proof.day_number][proof.validator_id] = proof
+        self._days[proof.day_number].set_proof(proof)
         logger.debug(f"Received published proof for day {proof.day_number} from {proof.validator_id.hex()} from peer.")
 
     async def handle_canonical_proof(self, canonical_proof: DayProof, day_number: int):
@@ -194,7 +529,7 @@ class DHTNetwork:
 
     async def handle_vdf_completion_time(self, day_number: int, validator_id: bytes, completion_time_seconds: float):
         """Handle a VDF completion time from a peer."""
-        self._vdf_completion_times[day_number][validator_id] = completion_time_seconds
+        self._days[day_number].set_time(validator_id, completion_time_seconds)
         logger.debug(f"Received VDF completion time for day {day_number} from {validator_id.hex()} from peer.")
 
     async def get_canonical_proof(self, day_number: int) -> Optional[DayProof]:
@@ -203,13 +538,18 @@ class DHTNetwork:
 
     async def get_proof_for_day(self, day_number: int) -> Dict[bytes, DayProof]:
         """Get all proofs for a specific day from local store."""
-        return self._proofs[day_number]
+        table = self._days.get(day_number)
+        return table.proofs_by_validator() if table is not None else {}
+
+    def completion_times(self, day_number: int) -> List[float]:
+        """Get the VDF completion times known for a specific day."""
+        table = self._days.get(day_number)
+        return table.completion_times() if table is not None else []
 
     async def publish_enc_share(self, enc_share_message: EncShare):
         """Publish an EncShare message to peers (Simulated)."""
         logger.debug(f"Publishing EncShare for epoch {enc_share_message.epoch} from {enc_share_message.proposer_id} to DHT (simulated)...")
-        for peer in self.peers:
-            await peer.handle_enc_share_from_peer(enc_share_message)
+        await self._gather_peers([peer.handle_enc_share_from_peer(enc_share_message) for peer in self.peers])
         await asyncio.sleep(0.05) # Simulate network delay
 
     async def handle_enc_share_from_peer(self, enc_share_message: EncShare):
@@ -222,35 +562,59 @@ class DHTNetwork:
     async def publish_blacklist_vote(self, blacklist_vote: BlacklistVote):
         """Publish a BlacklistVote message to peers (Simulated)."""
         logger.debug(f"Publishing BlacklistVote for {blacklist_vote.target_validator_id} from {blacklist_vote.voter_id} to DHT (simulated)...")
-        for peer in self.peers:
-            # In a real system, this would involve sending the message over the network.
-            # For simulation, we directly call the peer's consensus module.
-            if peer.validator_node_instance:
-                await peer.validator_node_instance.consensus.handle_blacklist_vote(blacklist_vote)
+        # In a real system, this would involve sending the message over the network.
+        # For simulation, we directly call each peer's consensus module.
+        await self._gather_peers([
+            peer.validator_node_instance.consensus.handle_blacklist_vote(blacklist_vote)
+            for peer in self.peers
+            if peer.validator_node_instance
+        ])
         await asyncio.sleep(0.05) # Simulate network delay
 
 
 # --- Consensus Module ---
+_LENGTH_PREFIX = struct.Struct("<I")
+
+
+def _simulate_coin_share(epoch: int, validator_id: str) -> bytes:
+    """Dummy coin share: 8-byte little-endian epoch followed by the validator id's digest."""
+    with blake3_hasher() as hasher:
+        hasher.update(validator_id.encode())
+        return struct.pack("<Q", epoch) + hasher.digest()
+
+
+def _proposal_order(proposal: RBCPropose) -> Tuple[str, bytes]:
+    """Fallback commit order for proposals when no common coin is available."""
+    return proposal.proposer_id, proposal.payload_hash
+
+
 class ConsensusModule:
     """Manages the BFT consensus protocol for the Chorus network."""
 
 
 
-    def __init__(self, config: Config, validator_id: str, validators: List[str]):
+    def __init__(self, config: Config, validator_id: str, validators: List[str], storage: Optional[ValidatorStorage] = None):
         """Initializes the ConsensusModule instance."""
         self.config = config
+        self.storage = storage  # Committed blocks are persisted here when set
         self.validator_id = validator_id
-        self.validators = validators
+        self.validators = list(validators)  # Own copy: nodes built from one id list must not share membership state
+        self._refresh_membership()
         self.current_epoch = 0
         self.event_log: List[Event] = []
         self.committed_blocks: Dict[int, Any] = {}
         self.proposals: Dict[int, Dict[str, RBCPropose]] = defaultdict(dict)  # Stores RBCPropose messages by epoch and proposer_id
-        self.received_enc_chunks: Dict[int, Dict[str, Dict[int, str]]] = defaultdict(lambda: defaultdict(dict))  # epoch -> proposer_id -> chunk_index -> chunk_value
-        self.reconstructed_payloads: Dict[int, Dict[str, str]] = defaultdict(dict)  # epoch -> proposer_id -> reconstructed_payload_hash
+        self.received_enc_chunks: Dict[Tuple[int, str], List[Optional[EncryptedShare]]] = {}  # (epoch, proposer_id) -> chunk slots, None until received
+        self.reconstructed_payloads: Dict[int, Dict[str, bytes]] = defaultdict(dict)  # epoch -> proposer_id -> reconstructed_payload_hash
+        self._chunk_mask: Dict[Tuple[int, str], int] = defaultdict(int)  # (epoch, proposer_id) -> bit i set once chunk i is in; its popcount is the distinct chunk count
+        self._pending_recon: Dict[Tuple[int, str], asyncio.Handle] = {}  # reconstructions scheduled but not yet run
+        self._rbc_done: Dict[Tuple[int, str], asyncio.Event] = {}  # (epoch, proposer_id) -> set once k chunks and the proposal are in
+        self._committable: Dict[int, List[RBCPropose]] = defaultdict(list)  # epoch -> reconstructed proposals, kept sorted by (proposer_id, payload_hash)
 
         # Simulated Common Coin state
-        self.coin_shares: Dict[int, Dict[str, str]] = defaultdict(dict)  # epoch -> proposer_id -> coin share
-        self.common_coin_value: Dict[int, Optional[str]] = defaultdict(lambda: None)  # epoch -> common coin value
+        self.coin_shares: Dict[int, Dict[str, bytes]] = defaultdict(dict)  # epoch -> proposer_id -> coin share
+        self._coin_share_order: Dict[int, List[str]] = defaultdict(list)  # epoch -> proposer_ids with a share, kept sorted
+        self.common_coin_value: Dict[int, Optional[bytes]] = defaultdict(lambda: None)  # epoch -> common coin value
         self.coin_threshold = self.config.validator.consensus.min_validators // 3 * 2 + 1  # 2f+1 for common coin
         self._blacklisted_validators: Set[str] = set() # Stores IDs of blacklisted validators
         self._blacklist_votes: Dict[str, Set[str]] = defaultdict(set) # target_validator_id -> set of voter_ids
@@ -258,25 +622,27 @@ class ConsensusModule:
 
         # VDF and Day Counter state (Note: VDF is managed by ValidatorNode, not ConsensusModule directly)
         self.day_proofs: Dict[int, Dict[bytes, DayProof]] = defaultdict(dict)  # day_number -> validator_id (pubkey bytes) -> DayProof
+        self._vdf_verify_cache: "OrderedDict[Tuple[int, bytes, int], bool]" = OrderedDict()  # (day, proof, iterations) -> verified
         logger.info("Initialized ConsensusModule")
 
     async def propose_batch(self, event_hashes: List[str], dht_network: "DHTNetwork") -> None:
         """Proposes a batch of event hashes for consensus in the current epoch."""
-        self.logger.info(f"Validator {self.validator_id} proposing batch for epoch {self.current_epoch} with {len(event_hashes)} events.")
+        logger.info("Validator %s proposing batch for epoch %s with %s events.", self.validator_id, self.current_epoch, len(event_hashes))
 
         # In a real implementation, these event_hashes would correspond to actual events
         # that have been received and validated by the Bridge.
         # For now, we'll treat the list of hashes as the payload.
-        payload_hash = blake3_hash(str(event_hashes)) # Hash of the list of event hashes
+        payload_hash = blake3_digest(str(event_hashes)) # Hash of the list of event hashes
 
         # Simulate erasure coding and threshold encryption
         # In a real implementation, this would involve complex cryptographic operations.
         # For now, we generate dummy encrypted chunks and a dummy coin share.
-        k = len(self.validators) // 3 + 1  # Minimum for BFT
-        n = len(self.validators)
-        # Generate dummy EncryptedShare objects
-        encrypted_batch_chunks = [EncryptedShare(share_id=i, data=f"enc_chunk_{i}_of_{payload_hash}") for i in range(n)]
-        coin_share_value = ThresholdSignature(epoch=self.current_epoch, signer_id=self.validator_id, signature_share=f"coin_share_for_{self.current_epoch}_from_{self.validator_id}") # Dummy coin share
+        k = self._k  # Minimum for BFT
+        n = self._n
+        # Generate dummy EncryptedShare objects. Every chunk refers to the same
+        # payload hash string; the index alone distinguishes them.
+        encrypted_batch_chunks = [EncryptedShare(share_id=i, data=payload_hash) for i in range(n)]
+        coin_share_value = ThresholdSignature(epoch=self.current_epoch, signer_id=self.validator_id, signature_share=_simulate_coin_share(self.current_epoch, self.validator_id)) # Dummy coin share
 
         rbc_propose_message = RBCPropose(
             epoch=self.current_epoch,
@@ -287,19 +653,18 @@ class ConsensusModule:
             n=n
         )
 
-        await self.handle_rbc_propose(rbc_propose_message)
+        # Each chunk's EncShare is built once and used for both local handling and publishing
+        enc_share_messages = self._enc_share_messages(rbc_propose_message)
+        await self.handle_rbc_propose(rbc_propose_message, enc_share_messages)
 
-        # Publish each encrypted chunk as an EncShare message concurrently
-        publish_tasks = []
-        for i, chunk in enumerate(encrypted_batch_chunks):
-            enc_share_message = EncShare(
-                epoch=self.current_epoch,
-                proposer_id=self.validator_id,
-                chunk_index=i,
-                enc_payload_share=chunk
-            )
-            publish_tasks.append(dht_network.publish_enc_share(enc_share_message))
-        await asyncio.gather(*publish_tasks)
+        # Publish the EncShare messages concurrently; one failed publish does not cancel the rest
+        results = await asyncio.gather(
+            *[dht_network.publish_enc_share(enc_share_message) for enc_share_message in enc_share_messages],
+            return_exceptions=True
+        )
+        for enc_share_message, result in zip(enc_share_messages, results):
+            if isinstance(result, BaseException):
+                logger.warning("Failed to publish EncShare %s for epoch %s: %r", enc_share_message.chunk_index, enc_share_message.epoch, result)
 
         coin_share_message = CoinShare(
             epoch=self.current_epoch,
@@ -308,63 +673,147 @@ class ConsensusModule:
         )
         await self.handle_coin_share(coin_share_message)
 
-    async def handle_rbc_propose(self, message: RBCPropose) -> None:
-        """Handles an RBC_PROPOSE message from another validator."""
-        logger.debug(f"Handling RBC_PROPOSE from {message.proposer_id} for epoch {message.epoch}. Received {len(message.enc_chunks)} encrypted chunks.")
+    @staticmethod
+    def _enc_share_messages(message: RBCPropose) -> List[EncShare]:
+        """Wraps each encrypted chunk of a proposal in its EncShare message."""
+        return [
+            EncShare(epoch=message.epoch, proposer_id=message.proposer_id, chunk_index=i, enc_payload_share=chunk)
+            for i, chunk in enumerate(message.enc_chunks)
+        ]
+
+    async def handle_rbc_propose(self, message: RBCPropose, enc_share_messages: Optional[List[EncShare]] = None) -> None:
+        """Handles an RBC_PROPOSE message from another validator.
+
+        A local proposer passes the EncShare messages it has already built so
+        they are not constructed a second time.
+        """
+        logger.debug("Handling RBC_PROPOSE from %s for epoch %s. Received %s encrypted chunks.", message.proposer_id, message.epoch, len(message.enc_chunks))
         self.proposals[message.epoch][message.proposer_id] = message
         self.reconstructed_payloads[message.epoch][message.proposer_id] = message.payload_hash
+        # Shares may have arrived before the proposal itself
+        self._maybe_schedule_reconstruction((message.epoch, message.proposer_id))
 
         # Simulate requesting EncShare messages from other validators concurrently
-        handle_enc_share_tasks = []
-        for i, enc_share_data in enumerate(message.enc_chunks):
-            enc_share_message = EncShare(
-                epoch=message.epoch,
-                proposer_id=message.proposer_id,
-                chunk_index=i,
-                enc_payload_share=enc_share_data
-            )
-            handle_enc_share_tasks.append(self.handle_enc_share(enc_share_message))
-        await asyncio.gather(*handle_enc_share_tasks)
+        if enc_share_messages is None:
+            enc_share_messages = self._enc_share_messages(message)
+        await asyncio.gather(*[self.handle_enc_share(enc_share_message) for enc_share_message in enc_share_messages])
 
         if self._is_rbc_complete(message.epoch, message.proposer_id):
-            logger.debug(f"RBC for epoch {message.epoch}, proposer {message.proposer_id} is complete.")
+            logger.debug("RBC for epoch %s, proposer %s is complete.", message.epoch, message.proposer_id)
 
     async def handle_enc_share(self, message: EncShare) -> None:
         """Handles an ENC_SHARE message from another validator."""
-        logger.debug(f"Handling ENC_SHARE from {message.proposer_id} for epoch {message.epoch}, chunk {message.chunk_index}. Encrypted share: {message.enc_payload_share}")
-        self.received_enc_chunks[message.epoch][message.proposer_id][message.chunk_index] = message.enc_payload_share.data
-
-        if self._is_rbc_complete(message.epoch, message.proposer_id):
-            self.logger.debug(f"Enough ENC_SHAREs collected for epoch {message.epoch}, proposer {message.proposer_id}. Simulating decryption.")
-            # In a real implementation, this would involve using threshold decryption
-            # to reconstruct the original payload from the collected shares.
-            # For now, we'll assume successful reconstruction and store the payload hash.
-            # The actual payload would be reconstructed here.
-            self.reconstructed_payloads[message.epoch][message.proposer_id] = self.proposals[message.epoch][message.proposer_id].payload_hash
+        logger.debug("Handling ENC_SHARE from %s for epoch %s, chunk %s. Encrypted share: %s", message.proposer_id, message.epoch, message.chunk_index, message.enc_payload_share)
+        key = (message.epoch, message.proposer_id)
+        # Shares may precede the proposal; the validator count bounds n until it arrives
+        proposal = self.proposals.get(message.epoch, {}).get(message.proposer_id)
+        n = proposal.n if proposal else self._n
+        index = message.chunk_index
+        if not 0 <= index < n:
+            logger.warning("Dropping ENC_SHARE from %s for epoch %s: chunk index %s outside 0..%s", message.proposer_id, message.epoch, index, n - 1)
+            return
+        slots = self.received_enc_chunks.get(key)
+        if slots is None:
+            slots = self.received_enc_chunks[key] = [None] * n
+        bit = 1 << index
+        mask = self._chunk_mask[key]
+        if mask & bit:
+            return  # Duplicate share
+        if index >= len(slots):
+            slots.extend([None] * (index + 1 - len(slots)))
+        slots[index] = message.enc_payload_share
+        self._chunk_mask[key] = mask | bit
+        self._maybe_schedule_reconstruction(key)
+
+    def _maybe_schedule_reconstruction(self, key: Tuple[int, str]) -> None:
+        """Handles completion once k distinct chunks of a proposal are in.
+
+        If the systematic chunks 0..k-1 are all present the batch is accepted
+        immediately; otherwise a single reconstruction is scheduled.
+        """
+        done = self.rbc_done(*key)
+        if done.is_set():
+            return
+        proposal = self.proposals.get(key[0], {}).get(key[1])
+        mask = self._chunk_mask[key]
+        if proposal is None or mask.bit_count() < proposal.k:
+            return
+        done.set()
+        systematic = (1 << proposal.k) - 1
+        if mask & systematic == systematic:
+            # Chunks 0..k-1 carry the batch verbatim in a systematic code: nothing to decode
+            self._accept_batch(key)
+        else:
+            self._pending_recon[key] = asyncio.get_running_loop().call_soon(self._reconstruct_batch, key)
+
+    def rbc_done(self, epoch: int, proposer_id: str) -> asyncio.Event:
+        """Returns the event set when Reliable Broadcast completes for a proposer in an epoch."""
+        key = (epoch, proposer_id)
+        done = self._rbc_done.get(key)
+        if done is None:
+            done = self._rbc_done[key] = asyncio.Event()
+        return done
+
+    def _reconstruct_batch(self, key: Tuple[int, str]) -> None:
+        """Reconstructs a proposer's batch; runs once per (epoch, proposer_id)."""
+        self._pending_recon.pop(key, None)
+        epoch, proposer_id = key
+        logger.debug("Enough ENC_SHAREs collected for epoch %s, proposer %s. Simulating decryption.", epoch, proposer_id)
+        # In a real implementation, this would involve using threshold decryption
+        # to reconstruct the original payload from the collected shares.
+        # For now, we'll assume successful reconstruction and store the payload hash.
+        # The actual payload would be reconstructed here.
+        self._accept_batch(key)
+
+    def _accept_batch(self, key: Tuple[int, str]) -> None:
+        """Records a proposer's recovered batch as committable."""
+        epoch, proposer_id = key
+        proposal = self.proposals[epoch][proposer_id]
+        self.reconstructed_payloads[epoch][proposer_id] = proposal.payload_hash
+        bisect.insort(self._committable[epoch], proposal, key=_proposal_order)
 
     def _is_rbc_complete(self, epoch: int, proposer_id: str) -> bool:
-        """Checks if Reliable Broadcast is complete for a given proposer in an epoch."""
-        if epoch not in self.proposals or proposer_id not in self.proposals[epoch]:
-            return False
-
-        expected_chunks_count = self.proposals[epoch][proposer_id].n
-        received_chunks_count = len(self.received_enc_chunks[epoch][proposer_id])
-
-        return received_chunks_count >= expected_chunks_count
+        """Checks if Reliable Broadcast is complete for a given proposer in an epoch.
+        Any k distinct chunks suffice to reconstruct the erasure-coded batch.
+        """
+        done = self._rbc_done.get((epoch, proposer_id))
+        return done is not None and done.is_set()
 
     async def handle_coin_share(self, message: CoinShare) -> None:
         """Handles a COIN_SHARE message from another validator."""
-        self.logger.debug(f"Handling COIN_SHARE for epoch {message.epoch} from {message.proposer_id}")
-        self.coin_shares[message.epoch][message.proposer_id] = message.coin_sig_share.signature_share
+        logger.debug("Handling COIN_SHARE for epoch %s from %s", message.epoch, message.proposer_id)
+        epoch_shares = self.coin_shares[message.epoch]
+        if message.proposer_id not in epoch_shares:
+            bisect.insort(self._coin_share_order[message.epoch], message.proposer_id)
+        epoch_shares[message.proposer_id] = message.coin_sig_share.signature_share
 
-        if len(self.coin_shares[message.epoch]) >= self.coin_threshold: # Use config for threshold
+        if len(epoch_shares) >= self.coin_threshold: # Use config for threshold
             if self.common_coin_value[message.epoch] is None:
                 # In a real implementation, we would derive the common coin from collected shares
                 # using a verifiable random function or threshold signatures.
                 # For now, we'll just log that we have enough shares and simulate derivation.
-                self.logger.info(f"Enough coin shares collected for epoch {message.epoch}. Simulating common coin derivation.")
+                logger.info("Enough coin shares collected for epoch %s. Simulating common coin derivation.", message.epoch)
                 # The common coin value should be deterministic based on the collected shares
-                self.common_coin_value[message.epoch] = blake3_hash(str(sorted(self.coin_shares[message.epoch].values()))) # Simulated derivation
+                self.common_coin_value[message.epoch] = self._derive_common_coin_stream(message.epoch) # Simulated derivation
+
+    def _derive_common_coin_stream(self, epoch: int) -> bytes:
+        """Hashes an epoch's coin shares in proposer order without building an intermediate list.
+
+        Each proposer id and share is length-prefixed so that distinct share
+        sets can never concatenate to the same input.
+        """
+        epoch_shares = self.coin_shares[epoch]
+        pack_len = _LENGTH_PREFIX.pack
+        with blake3_hasher() as hasher:
+            # Proposer order is maintained on insert
+            for proposer_id in self._coin_share_order[epoch]:
+                proposer_bytes = proposer_id.encode()
+                share = epoch_shares[proposer_id]
+                hasher.update(pack_len(len(proposer_bytes)))
+                hasher.update(proposer_bytes)
+                hasher.update(pack_len(len(share)))
+                hasher.update(share)
+            return hasher.digest()
 
     async def handle_rbc_enc_share(self, enc_share_message: EncShare):
         """Handles an EncShare message received from the DHTNetwork and passes it to the internal handler."""
@@ -372,101 +821,117 @@ class ConsensusModule:
 
     async def handle_commit(self, message: Commit) -> None:
         """Handles a COMMIT message, finalizing an epoch block."""
-        self.logger.info(f"Handling COMMIT for epoch {message.epoch}")
+        logger.info("Handling COMMIT for epoch %s", message.epoch)
         if message.epoch in self.proposals:
-            epoch_proposals = self.proposals[message.epoch]
+            # Run reconstructions that are due but whose callbacks have not fired yet
+            for key in [key for key in self._pending_recon if key[0] == message.epoch]:
+                self._pending_recon[key].cancel()
+                self._reconstruct_batch(key)
 
             # In a real implementation, we would decrypt the batch here
             # and verify its content against the payload_hash.
-            self.logger.debug(f"Simulating decryption and verification of batch for epoch {message.epoch}.")
+            logger.debug("Simulating decryption and verification of batch for epoch %s.", message.epoch)
             # For now, we'll assume any proposal that completed RBC is valid.
-            valid_proposals = []
-            for proposer_id, rbc_propose in epoch_proposals.items():
-                # Check if RBC is complete for this proposer
-                if self._is_rbc_complete(message.epoch, proposer_id):
-                    valid_proposals.append(rbc_propose)
+            # Reconstructed proposals are inserted in (proposer_id, payload_hash) order.
+            valid_proposals = self._committable.get(message.epoch, [])
 
             # Use the common coin to deterministically order the proposals
-            if self.common_coin_value[message.epoch]:
-                # Sort validators based on their hash with the common coin
-                def sort_key(proposer_id):
-                    return blake3_hash(f"{self.common_coin_value[message.epoch]}{proposer_id}")
-                
+            coin = self.common_coin_value[message.epoch]
+            if coin:
                 # Filter valid proposals to only include those from validators that are part of the current epoch's consensus
-                # and sort them deterministically using the common coin
-                ordered_proposals = await asyncio.to_thread(lambda: sorted(
-                    [p for p in valid_proposals if p.proposer_id in self.validators],
-                    key=lambda p: sort_key(p.proposer_id)
-                ))
+                # and sort them deterministically by the hash of the common coin and the proposer id.
+                # Keys are hashed once per proposal up front; the sort is small enough to run inline.
+                keyed = [
+                    (blake3_digest(coin + p.proposer_id.encode()), p)
+                    for p in valid_proposals
+                    if p.proposer_id in self._validators_set
+                ]
+                keyed.sort(key=itemgetter(0))
+                ordered_proposals = [p for _, p in keyed]
             else:
-                # Fallback to a simple sort if common coin is not available (should not happen in a healthy network)
-                self.logger.warning(f"Common coin not available for epoch {message.epoch}. Falling back to simple sort.")
-                ordered_proposals = await asyncio.to_thread(lambda: sorted(
-                    valid_proposals,
-                    key=lambda p: (p.proposer_id, p.payload_hash)
-                ))
+                # Fallback to the insertion order if common coin is not available (should not happen in a healthy network)
+                logger.warning("Common coin not available for epoch %s. Falling back to simple sort.", message.epoch)
+                ordered_proposals = list(valid_proposals)
 
-            self.logger.debug(f"Ordered proposals for epoch {message.epoch}: {[p.proposer_id for p in ordered_proposals]}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Ordered proposals for epoch %s: %s", message.epoch, [p.proposer_id for p in ordered_proposals])
 
             # The block_content_hash should be a hash of the *decrypted* and ordered events.
             # For now, we'll hash the payload_hashes from the proposals.
-            block_content_hash = blake3_hash([p.payload_hash for p in ordered_proposals])
+            with blake3_hasher() as hasher:
+                for p in ordered_proposals:
+                    hasher.update(p.payload_hash)
+                block_content_hash = hasher.hexdigest()
 
-            self.committed_blocks[message.epoch] = {
+            block = {
                 "block_digest": block_content_hash,
-                "proposals": [asdict(p) for p in ordered_proposals],
+                "proposals": ordered_proposals,  # Dataclasses; orjson serializes them natively
                 "common_coin": self.common_coin_value[message.epoch]
             }
-            self.logger.info(f"Committed block for epoch {message.epoch} with digest {block_content_hash}")
+            self.committed_blocks[message.epoch] = block
+            if self.storage is not None:
+                await self.storage.save_block(message.epoch, block)
+            logger.info("Committed block for epoch %s with digest %s", message.epoch, block_content_hash)
 
-            self.logger.info(f"Simulating ActivityPub export callback for epoch {message.epoch} with committed events.")
+            logger.info("Simulating ActivityPub export callback for epoch %s with committed events.", message.epoch)
 
         await self.advance_epoch()
 
     async def handle_day_proof(self, day_proof: DayProof) -> None:
         """Handles a DayProof event from another validator."""
-        self.logger.debug(f"Handling DayProof for day {day_proof.day_number} from {day_proof.validator_id.hex()}")
+        logger.debug("Handling DayProof for day %s from %s", day_proof.day_number, day_proof.validator_id.hex())
 
         # This method is primarily for the ConsensusModule to track proofs from other validators.
         # Actual VDF verification happens in ValidatorNode.
         # Here, we just store the proof if it's considered valid by the ValidatorNode.
         self.day_proofs[day_proof.day_number][day_proof.validator_id] = day_proof
-        self.logger.debug(f"Stored DayProof for day {day_proof.day_number} from {day_proof.validator_id.hex()}")
+        logger.debug("Stored DayProof for day %s from %s", day_proof.day_number, day_proof.validator_id.hex())
 
     async def handle_membership_change(self, message: MembershipChangeMessage) -> None:
         """Handles a MEMBERSHIP_CHANGE message."""
-        self.logger.info(f"Handling MEMBERSHIP_CHANGE for epoch {message.epoch}")
+        logger.info("Handling MEMBERSHIP_CHANGE for epoch %s", message.epoch)
         membership_change_event: MembershipChange = message.update
         if membership_change_event.change_type == "add":
-            if membership_change_event.validator_pubkey not in self.validators:
+            if membership_change_event.validator_pubkey not in self._validators_set:
                 self.validators.append(membership_change_event.validator_pubkey)
-                self.logger.info(f"Validator {membership_change_event.validator_pubkey} added to membership.")
+                self._refresh_membership()
+                logger.info("Validator %s added to membership.", membership_change_event.validator_pubkey)
         elif membership_change_event.change_type == "remove":
-            if membership_change_event.validator_pubkey in self.validators:
+            if membership_change_event.validator_pubkey in self._validators_set:
                 self.validators.remove(membership_change_event.validator_pubkey)
-                self.logger.info(f"Validator {membership_change_event.validator_pubkey} removed from membership.")
-        self.logger.debug(f"Current validators: {self.validators}")
+                self._refresh_membership()
+                logger.info("Validator %s removed from membership.", membership_change_event.validator_pubkey)
+        logger.debug("Current validators: %s", self._validators_sorted)
+
+    def _refresh_membership(self) -> None:
+        """Recomputes the membership caches; call after every change to self.validators."""
+        self._validators_set: Set[str] = set(self.validators)
+        self._validators_sorted: Tuple[str, ...] = tuple(sorted(self._validators_set))
+        self._n = len(self.validators)
+        self._k = self._n // 3 + 1  # f+1 chunks reconstruct a batch
+        self._quorum_2f1 = len(self._validators_set) // 3 * 2 + 1  # 2f+1 of the current membership
+        self.encryption_threshold = self._quorum_2f1
 
     async def advance_epoch(self) -> None:
         """Advances the Conductor to the next epoch (day number)."""
         self.current_epoch += 1
-        self.logger.info(f"Advanced to epoch {self.current_epoch}")
+        logger.info("Advanced to epoch %s", self.current_epoch)
 
     async def _manage_blacklist(self):
         """Placeholder for managing the blacklist (detecting and voting on malicious nodes)."""
-        self.logger.info("Placeholder: Performing blacklist management. (Future implementation will include evidence collection and BFT voting).")
+        logger.info("Placeholder: Performing blacklist management. (Future implementation will include evidence collection and BFT voting).")
         await self._detect_malicious_behavior(self.dht)
 
     async def _detect_malicious_behavior(self, dht_network: "DHTNetwork"):
         """Placeholder for detecting malicious behavior and initiating a voting process."""
-        self.logger.debug("Placeholder: Detecting malicious behavior.")
+        logger.debug("Placeholder: Detecting malicious behavior.")
         # In a real implementation, this would involve monitoring validator behavior,
         # verifying proofs, and identifying deviations from the protocol.
         # For simulation, let's assume a random validator (not self) is detected as malicious.
-        other_validators = [v for v in self.validators if v != self.validator_id and v not in self._blacklisted_validators]
+        other_validators = [v for v in self._validators_sorted if v != self.validator_id and v not in self._blacklisted_validators]
         if other_validators:
             malicious_validator = random.choice(other_validators)
-            self.logger.warning(f"Simulated detection: Validator {malicious_validator} is behaving maliciously. Initiating blacklist vote.")
+            logger.warning("Simulated detection: Validator %s is behaving maliciously. Initiating blacklist vote.", malicious_validator)
 
             # Create a blacklist vote message
             blacklist_vote = BlacklistVote(
@@ -481,40 +946,41 @@ class ConsensusModule:
 
     async def handle_blacklist_vote(self, message: BlacklistVote):
         """Handles a blacklist vote message from another validator."""
-        self.logger.info(f"Received blacklist vote from {message.voter_id} against {message.target_validator_id} for reason: {message.reason}")
+        logger.info("Received blacklist vote from %s against %s for reason: %s", message.voter_id, message.target_validator_id, message.reason)
         self._blacklist_votes[message.target_validator_id].add(message.voter_id)
 
         # Check if enough votes have been collected to blacklist the validator
         if len(self._blacklist_votes[message.target_validator_id]) >= self.coin_threshold:
             if message.target_validator_id not in self._blacklisted_validators:
-                self.logger.warning(f"Validator {message.target_validator_id} has been blacklisted by supermajority vote.")
+                logger.warning("Validator %s has been blacklisted by supermajority vote.", message.target_validator_id)
                 self._blacklisted_validators.add(message.target_validator_id)
                 # Remove from active validators if present
-                if message.target_validator_id in self.validators:
+                if message.target_validator_id in self._validators_set:
                     self.validators.remove(message.target_validator_id)
+                    self._refresh_membership()
                 # Clear votes for this validator
                 del self._blacklist_votes[message.target_validator_id]
 
     def _serialize_events(self, events: List[Event]) -> List[Dict[str, Any]]:
         """Serializes a list of Event objects into a list of dictionaries."""
-        return [asdict(event) for event in events]
+        return [event.to_dict() for event in events]
 
     def _simulate_encrypt_batch(self, batch: List[Dict[str, Any]], key: str) -> List[EncryptedShare]:
         """Simulates threshold encryption of a batch.
         In a real implementation, this would involve using a threshold encryption scheme
         to encrypt the batch and generate 'n' shares, where 'k' shares are needed for decryption.
         """
-        self.logger.debug(f"Simulating encryption of batch with key: {key}")
-        batch_hash = blake3_hash(str(batch)) # Hash of the batch content
-        # Generate dummy EncryptedShare objects
-        return [EncryptedShare(share_id=i, data=f"enc_share_{batch_hash}_{i}") for i in range(len(self.validators))]
+        logger.debug("Simulating encryption of batch with key: %s", key)
+        batch_hash = blake3_digest(str(batch)) # Hash of the batch content
+        # Generate dummy EncryptedShare objects sharing one batch hash reference
+        return [EncryptedShare(share_id=i, data=batch_hash) for i in range(self._n)]
 
     def _simulate_decrypt_batch(self, shares: List[EncryptedShare], key: str) -> List[Dict[str, Any]]:
         """Simulates threshold decryption of a batch.
         In a real implementation, this would involve collecting 'k' (threshold) shares
         and using a threshold decryption scheme to reconstruct the original batch.
         """
-        self.logger.debug(f"Simulating decryption with {len(shares)} shares and key: {key}")
+        logger.debug("Simulating decryption with %s shares and key: %s", len(shares), key)
         # For now, we just return a dummy decrypted event.
         return [{"simulated_decrypted_event": "data"}]
 
@@ -523,9 +989,18 @@ class ConsensusModule:
         In a real implementation, this would involve aggregating individual signatures
         from a supermajority of validators into a single, verifiable quorum certificate.
         """
-        self.logger.debug(f"Simulating Quorum Certificate generation for epoch/day {epoch_or_day}")
-        # For now, we just create a dummy aggregated signature.
-        aggregated_signature = blake3_hash(str(sorted(signatures.items()))) if signatures else ""
+        logger.debug("Simulating Quorum Certificate generation for epoch/day %s", epoch_or_day)
+        # For now, we just create a dummy aggregated signature: a streaming hash of the
+        # length-prefixed (validator_id, signature) pairs in validator order.
+        aggregated_signature = ""
+        if signatures:
+            pack_len = _LENGTH_PREFIX.pack
+            with blake3_hasher() as hasher:
+                for validator_id in sorted(signatures):
+                    for field in (validator_id.encode(), signatures[validator_id].encode()):
+                        hasher.update(pack_len(len(field)))
+                        hasher.update(field)
+                aggregated_signature = hasher.hexdigest()
         return QuorumCertificate(
             epoch_or_day=epoch_or_day,
             payload_hash=payload_hash,
@@ -538,30 +1013,44 @@ class ConsensusModule:
         In a real implementation, this would involve verifying the aggregated signature
         against the payload hash and ensuring it was signed by a supermajority of valid validators.
         """
-        self.logger.debug(f"Simulating Quorum Certificate verification for epoch/day {qc.epoch_or_day}")
+        logger.debug("Simulating Quorum Certificate verification for epoch/day %s", qc.epoch_or_day)
         # For now, we just check if there are enough signatures (simulated supermajority).
         return len(qc.signatures) >= self.coin_threshold
 
-    def _verify_signature(self, proof: DayProof) -> bool:
-        """Verifies the Ed25519 signature of a DayProof object."""
-        try:
-            verify_key = nacl.signing.VerifyKey(proof.validator_id)
-            # The signed message is the proof bytes itself
-            verify_key.verify(proof.proof, proof.signature)
-            return True
-        except nacl.exceptions.BadSignatureError:
-            self.logger.warning(f"Bad signature for proof from {proof.validator_id.hex()} for day {proof.day_number}")
-            return False
-        except Exception as e:
-            self.logger.error(f"Error verifying signature for proof from {proof.validator_id.hex()}: {e}")
-            return False
+    def _verify_signatures(self, proofs: List[DayProof]) -> List[bool]:
+        """Verifies the Ed25519 signatures of several DayProof objects in one batch.
+        The signed message of each proof is the proof bytes itself.
+        """
+        results = ed25519.verify_batch(
+            [proof.signature for proof in proofs],
+            [proof.proof for proof in proofs],
+            [proof.validator_id for proof in proofs],
+        )
+        for proof, ok in zip(proofs, results):
+            if not ok:
+                logger.warning("Bad signature for proof from %s for day %s", proof.validator_id.hex(), proof.day_number)
+        return results
+
+    def _verify_vdf(self, vdf_instance: ChorusVDF, day_number: int, proof: bytes) -> bool:
+        """Verify a day proof, reusing the outcome when the same proof is seen again."""
+        key = (day_number, proof, vdf_instance.iterations)
+        cache = self._vdf_verify_cache
+        result = cache.get(key)
+        if result is not None:
+            cache.move_to_end(key)
+            return result
+        result = vdf_instance.verify_day_proof(day_number, proof)
+        cache[key] = result
+        if len(cache) > VDF_VERIFY_CACHE_SIZE:
+            cache.popitem(last=False)
+        return result
 
     async def reach_consensus(self, day_number: int, local_proof: DayProof, dht_network: "DHTNetwork", vdf_instance: ChorusVDF) -> DayProof:
         """
         Orchestrates the consensus process for a given day's proof.
         Collects proofs from peers, verifies them, and determines the canonical proof.
         """
-        self.logger.info(f"Initiating consensus for day {day_number} with local proof from {local_proof.validator_id.hex()}")
+        logger.info("Initiating consensus for day %s with local proof from %s", day_number, local_proof.validator_id.hex())
 
         # Store our local proof
         self.day_proofs[day_number][local_proof.validator_id] = local_proof
@@ -572,24 +1061,27 @@ class ConsensusModule:
         for proof in peer_proofs:
             if proof.validator_id not in self.day_proofs[day_number]:
                 self.day_proofs[day_number][proof.validator_id] = proof
-                self.logger.debug(f"Collected peer proof for day {day_number} from {proof.validator_id.hex()}")
+                logger.debug("Collected peer proof for day %s from %s", day_number, proof.validator_id.hex())
 
         valid_proofs = []
-        for proof in self.day_proofs[day_number].values():
-            # Verify the VDF proof and the signature
-            if vdf_instance.verify_day_proof(proof.day_number, proof.proof) and self._verify_signature(proof):
+        candidates = list(self.day_proofs[day_number].values())
+        # Check all signatures in one batch; only proofs that fail are rejected.
+        signature_ok = self._verify_signatures(candidates)
+        for proof, sig_ok in zip(candidates, signature_ok):
+            # Verify the signature and the VDF proof
+            if sig_ok and self._verify_vdf(vdf_instance, proof.day_number, proof.proof):
                 # If a quorum certificate is present, verify it
                 if proof.quorum_cert:
                     if self._verify_quorum_certificate(proof.quorum_cert):
                         valid_proofs.append(proof)
                     else:
-                        self.logger.warning(f"Invalid quorum certificate for proof from {proof.validator_id.hex()} for day {day_number}. Ignoring.")
+                        logger.warning("Invalid quorum certificate for proof from %s for day %s. Ignoring.", proof.validator_id.hex(), day_number)
                 else:
                     # For now, if no QC is present, we still consider it valid if VDF and signature are good.
                     # In a real system, a QC would likely be mandatory.
                     valid_proofs.append(proof)
             else:
-                self.logger.warning(f"Invalid proof from {proof.validator_id.hex()} for day {day_number}. Ignoring.")
+                logger.warning("Invalid proof from %s for day %s. Ignoring.", proof.validator_id.hex(), day_number)
 
         # Simulate generating a quorum certificate for the canonical proof
         # In a real system, this would involve collecting signatures from a supermajority
@@ -602,82 +1094,43 @@ class ConsensusModule:
             # Collect simulated signatures for the canonical proof
             simulated_signatures = {p.validator_id.hex(): p.signature.hex() for p in valid_proofs}
             quorum_cert = self._generate_quorum_certificate(day_number, blake3_hash(canonical_proof.proof), simulated_signatures)
-            canonical_proof.quorum_cert = quorum_cert
-            return canonical_proof
+            return replace(canonical_proof, quorum_cert=quorum_cert)
         else:
             raise ConsensusError(f"Could not reach consensus for day {day_number}: No valid proofs found.")
 
 
-# --- gRPC Service (Placeholder) ---
-class ConductorService(conductor_pb2_grpc.ConductorServiceServicer):
-    """gRPC service for Conductor."""
+# --- Validator Node ---
+def _compute_day_proof(genesis_seed: bytes, iterations: int, day_number: int) -> Tuple[bytes, float]:
+    """Computes a day proof in a worker process; returns it with the compute time in seconds."""
+    start_time = time.monotonic()
+    proof = ChorusVDF(genesis_seed, iterations=iterations).compute_day_proof(day_number)
+    return proof, time.monotonic() - start_time
 
-    def __init__(self, validator_node_instance: "ValidatorNode"):
-        self.validator_node = validator_node_instance
-        self.logger = logging.getLogger("ConductorService")
 
-    async def SubmitEventBatch(self, request: conductor_pb2.SubmitEventBatchRequest, context) -> conductor_pb2.SubmitEventBatchResponse:
-        self.logger.info(f"Received event batch with {len(request.events)} events for epoch {request.epoch}.")
-        try:
-            await self.validator_node.consensus.propose_batch(list(request.events), self.validator_node.dht)
-            return conductor_pb2.SubmitEventBatchResponse(batch_id="placeholder_batch_id", status="pending")
-        except ConsensusError as e:
-            context.set_code(grpc.StatusCode.ABORTED)
-            context.set_details(f"Consensus error during batch proposal: {e}")
-            return conductor_pb2.SubmitEventBatchResponse(batch_id="", status="failed")
-        except Exception as e:
-            context.set_code(grpc.StatusCode.INTERNAL)
-            context.set_details(f"Internal error during batch proposal: {e}")
-            return conductor_pb2.SubmitEventBatchResponse(batch_id="", status="failed")
-
-    async def GetBlock(self, request: conductor_pb2.GetBlockRequest, context) -> conductor_pb2.GetBlockResponse:
-        self.logger.info(f"Received request for block {request.epoch}.")
-        block = self.validator_node.consensus.committed_blocks.get(request.epoch)
-        if block:
-            return conductor_pb2.GetBlockResponse(
-                epoch=block["epoch"],
-                block_hash=block["block_digest"],
-                merkle_root="placeholder_merkle_root", # Merkle root not yet implemented
-                events=[p["payload_hash"] for p in block["proposals"]], # Assuming proposals contain payload_hash
-                quorum_cert=block["quorum_cert"] if "quorum_cert" in block else "placeholder_quorum_cert"
-            )
-        else:
-            context.set_code(grpc.StatusCode.NOT_FOUND)
-            context.set_details(f"Block for epoch {request.epoch} not found.")
-            return conductor_pb2.GetBlockResponse()
-
-    async def GetDayProof(self, request: conductor_pb2.GetDayProofRequest, context) -> conductor_pb2.GetDayProofResponse:
-        self.logger.info(f"Received request for day proof {request.day}.")
-        day_proof = self.validator_node.dht._canonical_proofs.get(request.day)
-        if day_proof:
-            return conductor_pb2.GetDayProofResponse(
-                day_number=day_proof.day_number,
-                vdf_proof=day_proof.proof.hex(), # Convert bytes to hex string
-                difficulty=self.validator_node.vdf.iterations, # Use current VDF difficulty
-                quorum_cert=day_proof.quorum_cert.aggregated_signature if day_proof.quorum_cert else "" # Return aggregated signature if present
-            )
-        else:
-            context.set_code(grpc.StatusCode.NOT_FOUND)
-            context.set_details(f"Day proof for day {request.day} not found.")
-            return conductor_pb2.GetDayProofResponse()
-
-# --- Validator Node ---
 class ValidatorNode:
     """Complete Chorus Federation Validator Node as per CFP-001."""
 
     def __init__(self,
                  config: Config,
                  validator_keypair: tuple,  # (private_key_bytes, public_key_bytes)
-                 all_validator_ids: List[str]): # All validator public key hex strings in the simulated network
+                 all_validator_ids: List[str], # All validator public key hex strings in the simulated network
+                 peer_registry: Optional[PeerRegistry] = None): # Shared registry of simulated DHT peers
         self.config = config
         self.keypair = validator_keypair
         self.public_key = validator_keypair[1]
         self.bootstrap_peers = config.validator.network.bootstrap_peers
-        self.storage = ValidatorStorage(config.validator.storage.path)
+        self.storage = ValidatorStorage(config.validator.storage.path, sync=config.validator.storage.sync)
         self.vdf = ChorusVDF(GENESIS_SEED, iterations=config.validator.vdf.iterations)
-        self.dht = DHTNetwork(self.bootstrap_peers, self.keypair, self) # Pass self (ValidatorNode instance)
+        # The VDF chain is pure CPU-bound Python; a worker process keeps it from
+        # competing with consensus handlers for the GIL.
+        self._vdf_executor = concurrent.futures.ProcessPoolExecutor(max_workers=1)
+        # Next-day prefetches get their own worker so a retry of the current day
+        # never queues behind a speculative computation.
+        self._prefetch_executor = concurrent.futures.ProcessPoolExecutor(max_workers=1)
+        self._pending_vdf: Dict[int, Tuple[int, asyncio.Future]] = {}  # day -> (iterations, proof future)
+        self.dht = DHTNetwork(self.bootstrap_peers, self.keypair, self, registry=peer_registry) # Pass self (ValidatorNode instance)
         # Initialize ConsensusModule with the full list of validator IDs
-        self.consensus = ConsensusModule(self.config, self.public_key.hex(), all_validator_ids)
+        self.consensus = ConsensusModule(self.config, self.public_key.hex(), all_validator_ids, storage=self.storage)
         self._current_day = 0  # Initialize internal day counter
         self.logger = logging.getLogger(__name__) # Add logger instance
         self.logger.info("Initialized ValidatorNode")
@@ -689,9 +1142,6 @@ class ValidatorNode:
         await self.dht.initialize()
         await self._sync_historical_proofs()
 
-        # Start gRPC server
-        asyncio.create_task(self._start_grpc_server())
-
         asyncio.create_task(self._daily_computation_loop())
 
         logger.info("Validator node running")
@@ -706,13 +1156,12 @@ class ValidatorNode:
             self.logger.info(f"Attempting to compute and finalize proof for day {current_day_to_compute}")
 
             try:
-                start_time = time.monotonic()
-                proof_bytes = await asyncio.to_thread(
-                    self.vdf.compute_day_proof,
-                    current_day_to_compute
-                )
-                end_time = time.monotonic()
-                completion_time_seconds = end_time - start_time
+                proof_future = self._schedule_day_proof(current_day_to_compute)
+                try:
+                    # Measured in the worker, so a prefetched proof reports its compute time only
+                    proof_bytes, completion_time_seconds = await proof_future
+                finally:
+                    self._pending_vdf.pop(current_day_to_compute, None)
 
                 proof = DayProof(
                     day_number=current_day_to_compute,
@@ -725,6 +1174,9 @@ class ValidatorNode:
                 await self.dht.publish_proof(proof)
                 await self.dht.publish_vdf_completion_time(current_day_to_compute, self.public_key, completion_time_seconds)
 
+                # Start the next day's proof while this day's consensus runs
+                self._schedule_day_proof(current_day_to_compute + 1, prefetch=True)
+
                 canonical = await self.consensus.reach_consensus(
                     current_day_to_compute,
                     proof,
@@ -749,10 +1201,37 @@ class ValidatorNode:
                 self.logger.error(f"Unhandled error computing day proof for day {current_day_to_compute}: {e}. Retrying after delay. (More specific exception handling needed for production)")
                 await asyncio.sleep(5) # Small delay before retrying
 
+    def _schedule_day_proof(self, day_number: int, prefetch: bool = False) -> asyncio.Future:
+        """Returns the pending proof computation for a day, submitting it if needed.
+
+        A prefetched computation is discarded if the VDF difficulty has been
+        adjusted since it was submitted; its replacement runs on the main worker.
+        """
+        pending = self._pending_vdf.get(day_number)
+        if pending is not None:
+            iterations, proof_future = pending
+            if iterations == self.vdf.iterations:
+                return proof_future
+            proof_future.cancel()
+        proof_future = asyncio.get_running_loop().run_in_executor(
+            self._prefetch_executor if prefetch else self._vdf_executor,
+            _compute_day_proof,
+            self.vdf.genesis_seed,
+            self.vdf.iterations,
+            day_number
+        )
+        self._pending_vdf[day_number] = (self.vdf.iterations, proof_future)
+        return proof_future
+
+    async def stop(self):
+        """Stop background workers and flush pending storage writes."""
+        self._vdf_executor.shutdown(wait=False, cancel_futures=True)
+        self._prefetch_executor.shutdown(wait=False, cancel_futures=True)
+        await self.storage.close()
+
     def _sign_proof(self, proof: bytes) -> bytes:
         """Sign proof with validator's private key."""
-        signing_key = nacl.signing.SigningKey(self.keypair[0])
-        return signing_key.sign(proof).signature
+        return ed25519.sign(proof, self.keypair[0], self.public_key)
 
     async def _sync_historical_proofs(self):
         """Download historical proofs from DHT and initialize _current_day."""
@@ -768,15 +1247,17 @@ class ValidatorNode:
         day_to_fetch = 0
         if latest_canonical_day >= 0:
             self.logger.info(f"Latest canonical day found on DHT: {latest_canonical_day}. Syncing backwards.")
-            # Sync from the latest canonical day down to 0
+            # Sync from the latest canonical day down to 0, storing the proofs in one transaction
+            synced = []
             for day in range(latest_canonical_day, -1, -1):
                 proof = await self.dht.fetch_proof(day)
                 if proof:
-                    await self.storage.save_proof(proof)
+                    synced.append(proof)
                     self.logger.info(f"Synced historical proof for day {day}")
                 else:
                     self.logger.warning(f"No canonical proof found on DHT for day {day}. Stopping backward sync.")
                     break
+            await self.storage.save_proofs(synced)
             day_to_fetch = latest_canonical_day + 1 # Start computing from the next day
         else:
             self.logger.info("No canonical proofs found on DHT. Starting from day 0.")
@@ -803,7 +1284,7 @@ class ValidatorNode:
             # In a real implementation, this would involve fetching actual completion times
             # and potentially a BFT consensus on the median.
             previous_day = self._current_day - 1
-            completion_times = [t for t in self.dht._vdf_completion_times[previous_day].values() if t > 0]
+            completion_times = [t for t in self.dht.completion_times(previous_day) if t > 0]
 
             if completion_times:
                 median_completion_seconds = sorted(completion_times)[len(completion_times) // 2]
@@ -822,16 +1303,3 @@ class ValidatorNode:
                 self.logger.info(f"VDF difficulty adjusted. New iterations: {self.vdf.iterations}")
             else:
                 self.logger.warning("Median completion time is zero, skipping difficulty adjustment.")
-
-    
-
-        async def _start_grpc_server(self):
-            """Starts the gRPC server for receiving event batches."""
-            server = grpc.aio.server(concurrent.futures.ThreadPoolExecutor(max_workers=10))
-            conductor_pb2_grpc.add_ConductorServiceServicer_to_server(ConductorService(self), server)
-            server.add_insecure_port(f"[::]:{self.config.validator.network.listen_address.split(':')[1]}") # Use configured port
-            self.logger.info(f"gRPC server listening on {self.config.validator.network.listen_address}")
-            await server.start()
-            await server.wait_for_termination()
-
-    
\ No newline at end of file
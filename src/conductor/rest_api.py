@@ -8,10 +8,12 @@ import json
 
 from fastapi import FastAPI, HTTPException, Depends, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 from pydantic import BaseModel, Field
 
 from conductor.errors import ConductorError
+from conductor.hashing import blake3_hash
 from conductor.metrics import metrics
 from conductor.logging_config import get_logger
 
@@ -184,7 +186,7 @@ async def submit_event_batch(request: EventBatchRequest):
         batch = EventBatch(events=events)
         
         # Submit to consensus (simplified)
-        batch_id = f"batch_{request.epoch}_{hash(str(events)) % 10000}"
+        batch_id = f"batch_{request.epoch}_{blake3_hash(request.events)[:16]}"
         
         # Record metrics
         latency = asyncio.get_event_loop().time() - start_time
@@ -271,17 +273,10 @@ async def get_consensus_status(batch_id: str):
 
 @app.get("/metrics")
 async def get_metrics():
-    """Get Prometheus metrics."""
+    """Get Prometheus metrics in the text exposition format."""
     try:
-        # In a real implementation, you'd return actual Prometheus metrics
-        # For now, return a simple JSON response
-        return {
-            "metrics": {
-                "conductor_consensus_rounds_total": 0,
-                "conductor_vdf_computation_duration_seconds": 0,
-                "conductor_peer_connections": 0
-            }
-        }
+        metrics.flush()  # Publish buffered request metrics so the scrape is current
+        return Response(generate_latest(metrics.registry), media_type=CONTENT_TYPE_LATEST)
     except Exception as e:
         logger.error("Metrics endpoint error", error=str(e))
         raise HTTPException(status_code=500, detail=str(e))
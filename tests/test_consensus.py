@@ -2,6 +2,7 @@
 
 import pytest
 import asyncio
+from unittest.mock import AsyncMock
 from conductor.consensus import ReliableBroadcast, CommonCoin, Fragment
 from conductor.crypto import ThresholdCrypto
 from conductor.models import EventBatch, Event
@@ -40,8 +41,8 @@ class TestReliableBroadcast:
         """Test RBC propose functionality."""
         batch_id = await rbc.rbc_propose(sample_batch, "proposer1")
         
-        assert isinstance(batch_id, str)
-        assert len(batch_id) > 0
+        assert isinstance(batch_id, bytes)
+        assert len(batch_id) == 32
         assert batch_id in rbc.pending_batches
         
     def test_serialize_batch(self, rbc, sample_batch):
@@ -89,6 +90,34 @@ class TestReliableBroadcast:
         assert batch_id in rbc.received_fragments
         assert 0 in rbc.received_fragments[batch_id]
         
+    @pytest.mark.asyncio
+    async def test_small_fragment_verified_inline(self, sample_batch, monkeypatch):
+        """Small fragments are proven on the event loop; large ones go to a thread."""
+        rbc = ReliableBroadcast(n=100, f=33)
+        rbc._send_fragments = AsyncMock()
+        batch_id = await rbc.rbc_propose(sample_batch, "proposer1")
+        fragments = rbc._send_fragments.call_args.args[1]
+        assert 5 not in rbc.received_fragments[batch_id]
+
+        thread_calls = []
+
+        async def recording_to_thread(func, *args, **kwargs):
+            thread_calls.append(args)
+            return func(*args, **kwargs)
+
+        monkeypatch.setattr("conductor.consensus.asyncio.to_thread", recording_to_thread)
+        await rbc.handle_echo("validator1", batch_id, fragments[5], 5)
+
+        assert rbc.received_fragments[batch_id][5] is fragments[5]
+        assert 5 in rbc.pending_batches[batch_id]["verified_leaves"]
+        assert thread_calls == []
+
+        monkeypatch.setattr("conductor.consensus.INLINE_VERIFY_MAX_BYTES", len(fragments[6].data) - 1)
+        await rbc.handle_echo("validator2", batch_id, fragments[6], 6)
+
+        assert rbc.received_fragments[batch_id][6] is fragments[6]
+        assert thread_calls == [(fragments[6], batch_id)]
+
     @pytest.mark.asyncio
     async def test_handle_ready(self, rbc, sample_batch):
         """Test ready message handling."""
@@ -100,8 +129,26 @@ class TestReliableBroadcast:
         
         # Check that ready message was recorded
         assert batch_id in rbc.ready_messages
-        assert "validator1" in rbc.ready_messages[batch_id]
+        assert rbc.ready_senders(batch_id) == {"validator1"}
         
+    @pytest.mark.asyncio
+    async def test_verify_fragment_merkle_proof(self, sample_batch):
+        """Test that fragments verify against the cached Merkle layer and tampering is caught."""
+        rbc = ReliableBroadcast(n=100, f=33)
+        rbc._send_fragments = AsyncMock()
+        batch_id = await rbc.rbc_propose(sample_batch, "proposer1")
+        fragments = rbc._send_fragments.call_args.args[1]
+
+        assert rbc.pending_batches[batch_id]["proof_steps"] > 0
+        assert all(rbc._verify_fragment(f, batch_id) for f in fragments)
+        assert len(rbc.pending_batches[batch_id]["verified_leaves"]) == len(fragments)
+        assert rbc._verify_fragment(fragments[5], batch_id)  # Replay hits the verified-leaf cache
+
+        tampered = Fragment(index=5, data=fragments[5].data + b"x", merkle_proof=fragments[5].merkle_proof)
+        assert not rbc._verify_fragment(tampered, batch_id)
+        misplaced = Fragment(index=6, data=fragments[5].data, merkle_proof=fragments[5].merkle_proof)
+        assert not rbc._verify_fragment(misplaced, batch_id)
+
     def test_reconstruct_batch(self, rbc):
         """Test batch reconstruction."""
         fragments = [
@@ -117,6 +164,49 @@ class TestReliableBroadcast:
         expected = b"fragment0fragment1fragment2"
         assert reconstructed == expected
         
+    def test_reconstruct_batch_from_parity(self, rbc):
+        """Test reconstruction when data fragments are lost."""
+        data = b"test_data_for_erasure_coding"
+        fragments = rbc._erasure_encode(data)
+
+        reconstructed = rbc._reconstruct_batch(fragments[rbc.n - rbc.k:], len(data))
+        assert reconstructed == data
+
+    @pytest.mark.asyncio
+    async def test_deliver_after_ready_quorum(self, rbc, sample_batch):
+        """Test delivery once 2f+1 validators are ready."""
+        batch_id = await rbc.rbc_propose(sample_batch, "proposer1")
+
+        for validator in ("validator1", "validator2", "validator3"):
+            await rbc.handle_ready(validator, batch_id)
+
+        assert rbc.is_delivered(batch_id)
+        assert rbc.delivered_data[batch_id] == rbc._serialize_batch(sample_batch)
+
+    @pytest.mark.asyncio
+    async def test_deliver_without_seeing_proposal(self, rbc, sample_batch):
+        """A node that only received echoes delivers the exact batch, and refuses forged fragments."""
+        proposer = ReliableBroadcast(n=5, f=1)
+        proposer._send_fragments = AsyncMock()
+        batch_id = await proposer.rbc_propose(sample_batch, "proposer1")
+        fragments = proposer._send_fragments.call_args.args[1]
+
+        for i, fragment in enumerate(fragments[:rbc.k]):
+            await rbc.handle_echo(f"validator{i}", batch_id, fragment, fragment.index)
+        for validator in ("validator1", "validator2", "validator3"):
+            await rbc.handle_ready(validator, batch_id)
+
+        assert batch_id not in rbc.pending_batches
+        assert rbc.delivered_data[batch_id] == proposer._serialize_batch(sample_batch)
+
+        forged_id = bytes(32)
+        for i, fragment in enumerate(fragments[:rbc.k]):
+            await rbc.handle_echo(f"validator{i}", forged_id, fragment, fragment.index)
+        for validator in ("validator1", "validator2", "validator3"):
+            await rbc.handle_ready(validator, forged_id)
+
+        assert not rbc.is_delivered(forged_id)
+
     def test_is_delivered(self, rbc):
         """Test delivery status check."""
         batch_id = "test_batch"
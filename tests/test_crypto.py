@@ -106,6 +106,33 @@ class TestThresholdCrypto:
         # This is a simplified test - in reality verification would be more complex
         result = crypto.verify_aggregated(message, signature, public_keys)
         assert isinstance(result, bool)
+
+    def test_verify_aggregated_round_trip(self):
+        """Test that real shares verify and forged or reused ones do not."""
+        crypto = ThresholdCrypto(n=5, t=3)
+        keypairs = [crypto.generate_keypair() for _ in range(5)]
+        public_keys = [public_key for _, public_key in keypairs]
+        message = b"test_message"
+        shares = [crypto.sign_share(message, i + 1, keypairs[i][0]) for i in range(3)]
+
+        aggregated = crypto.aggregate_signatures(shares)
+        assert crypto.verify_aggregated(message, aggregated, public_keys)
+        assert not crypto.verify_aggregated(b"other_message", aggregated, public_keys)
+        assert not crypto.verify_aggregated(message, crypto.aggregate_signatures([shares[0]] * 3), public_keys)
+
+    @pytest.mark.asyncio
+    async def test_verify_aggregated_async_rejects_tampered_share(self):
+        """Test that the threaded verifier drops a corrupted share from the count."""
+        crypto = ThresholdCrypto(n=5, t=3)
+        keypairs = [crypto.generate_keypair() for _ in range(5)]
+        public_keys = [public_key for _, public_key in keypairs]
+        message = b"test_message"
+        shares = [crypto.sign_share(message, i + 1, keypairs[i][0]) for i in range(4)]
+
+        assert await crypto.verify_aggregated_async(message, crypto.aggregate_signatures(shares), public_keys)
+        shares[0] = shares[0][:-1] + bytes([shares[0][-1] ^ 1])
+        shares[1] = shares[1][:-1] + bytes([shares[1][-1] ^ 1])
+        assert not await crypto.verify_aggregated_async(message, crypto.aggregate_signatures(shares), public_keys)
         
     def test_generate_keypair(self):
         """Test keypair generation."""
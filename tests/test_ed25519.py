@@ -0,0 +1,57 @@
+"""Tests for the raw-bytes Ed25519 helpers."""
+
+import nacl.signing
+import pytest
+
+from conductor import ed25519
+
+
+class TestEd25519:
+    """Test cases for the ed25519 module."""
+
+    def test_keygen_sizes(self):
+        """Test that keygen returns a raw seed and public key."""
+        seed, public_key = ed25519.keygen()
+        assert len(seed) == ed25519.SEED_SIZE
+        assert len(public_key) == ed25519.PUBLIC_KEY_SIZE
+        assert ed25519.public_key_from_seed(seed) == public_key
+
+    def test_sign_matches_pynacl(self):
+        """Test that signatures match PyNaCl's SigningKey."""
+        seed, public_key = ed25519.keygen()
+        message = b"day proof"
+        expected = nacl.signing.SigningKey(seed).sign(message).signature
+        assert ed25519.sign(message, seed, public_key) == expected
+
+    def test_verify(self):
+        """Test verification of good and tampered signatures."""
+        seed, public_key = ed25519.keygen()
+        signature = ed25519.sign(b"msg", seed, public_key)
+        assert ed25519.verify(signature, b"msg", public_key)
+        assert not ed25519.verify(signature, b"other", public_key)
+
+    def test_verify_batch_identifies_offender(self):
+        """Test that batch verification rejects only the bad entry."""
+        keys = [ed25519.keygen() for _ in range(4)]
+        messages = [f"event {i}".encode() for i in range(4)]
+        signatures = [ed25519.sign(m, s, p) for m, (s, p) in zip(messages, keys)]
+        signatures[2] = bytes(64)
+        public_keys = [p for _, p in keys]
+        assert ed25519.verify_batch(signatures, messages, public_keys) == [True, True, False, True]
+
+    def test_verify_batch_length_mismatch(self):
+        """Test that misaligned inputs are rejected."""
+        with pytest.raises(ValueError):
+            ed25519.verify_batch([b""], [], [])
+
+    def test_read_key_file_from_generate_keys(self, tmp_path, capsys):
+        """Test that a key file written by generate_keys.py loads as a usable seed."""
+        from generate_keys import generate_keypair
+
+        path = tmp_path / "keys" / "validator_key.pem"
+        generate_keypair(str(path))
+        printed_public_key = capsys.readouterr().out.split("Public key (hex): ")[1].split()[0]
+
+        seed = ed25519.read_key_file(path)
+        assert len(seed) == ed25519.SEED_SIZE
+        assert ed25519.public_key_from_seed(seed).hex() == printed_public_key
@@ -0,0 +1,48 @@
+"""Tests for Reed-Solomon erasure coding."""
+
+import itertools
+import os
+
+import pytest
+
+from conductor.erasure import ReedSolomon, gf_inv, gf_mul
+
+
+def test_field_inverse():
+    for a in range(1, 256):
+        assert gf_mul(a, gf_inv(a)) == 1
+
+
+def test_encode_is_systematic():
+    rs = ReedSolomon(k=3, n=5)
+    data = b"abcdefghi"
+    shards = rs.encode(data)
+
+    assert len(shards) == 5
+    assert b"".join(shards[:3]) == data
+    assert len({len(s) for s in shards}) == 1
+
+
+@pytest.mark.parametrize("k,n", [(1, 3), (3, 5), (4, 7)])
+def test_any_k_shards_recover_payload(k, n):
+    rs = ReedSolomon(k=k, n=n)
+    data = os.urandom(41)
+    shards = rs.encode(data)
+
+    for indices in itertools.combinations(range(n), k):
+        assert rs.decode({i: shards[i] for i in indices}, len(data)) == data
+
+
+def test_decode_insufficient_shards():
+    rs = ReedSolomon(k=3, n=5)
+    shards = rs.encode(b"payload")
+
+    with pytest.raises(ValueError, match="Need at least 3 shards"):
+        rs.decode({0: shards[0], 4: shards[4]})
+
+
+def test_invalid_parameters():
+    with pytest.raises(ValueError):
+        ReedSolomon(k=0, n=3)
+    with pytest.raises(ValueError):
+        ReedSolomon(k=2, n=300)
@@ -1,7 +1,7 @@
 import pytest
 import blake3
 import json
-from src.conductor.hashing import blake3_hash
+from src.conductor.hashing import PARALLEL_HASH_THRESHOLD, blake3_digest, blake3_hash, blake3_hasher
 
 def test_blake3_hash_string():
     data = "hello world"
@@ -29,3 +29,41 @@ def test_blake3_hash_empty_bytes():
 def test_blake3_hash_empty_dict():
     data = {}
     assert blake3_hash(data) == blake3.blake3(json.dumps(data, sort_keys=True).encode('utf-8')).hexdigest()
+
+def test_blake3_digest_matches_hex_hash():
+    for data in ("hello world", b"hello world", {"a": 1}):
+        digest = blake3_digest(data)
+        assert len(digest) == 32
+        assert digest.hex() == blake3_hash(data)
+
+def test_blake3_digest_hashes_buffers_directly():
+    data = b"hello world"
+    assert blake3_digest(bytearray(data)) == blake3_digest(data)
+    assert blake3_digest(memoryview(data)) == blake3.blake3(data).digest()
+
+def test_blake3_digest_large_input_matches_serial_hash():
+    data = bytes(range(256)) * (PARALLEL_HASH_THRESHOLD // 256 + 1)
+    assert blake3_digest(data) == blake3.blake3(data).digest()
+    assert blake3_hash("x" * PARALLEL_HASH_THRESHOLD) == blake3.blake3(b"x" * PARALLEL_HASH_THRESHOLD).hexdigest()
+
+def test_blake3_hasher_incremental():
+    with blake3_hasher() as hasher:
+        hasher.update(b"hello ")
+        hasher.update(b"world")
+        assert hasher.hexdigest() == blake3_hash(b"hello world")
+
+def test_blake3_hasher_is_reset_between_uses():
+    with blake3_hasher() as hasher:
+        hasher.update(b"stale")
+    with blake3_hasher() as hasher:
+        hasher.update(b"fresh")
+        assert hasher.hexdigest() == blake3_hash(b"fresh")
+
+def test_blake3_hasher_nested_uses_are_independent():
+    with blake3_hasher() as outer:
+        outer.update(b"outer")
+        with blake3_hasher() as inner:
+            assert inner is not outer
+            inner.update(b"inner")
+            assert inner.hexdigest() == blake3_hash(b"inner")
+        assert outer.hexdigest() == blake3_hash(b"outer")
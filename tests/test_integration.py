@@ -131,7 +131,7 @@ class TestConductorIntegration:
         # Test message broadcasting
         message = b"test_message"
         await network.broadcast_message(message, "test_topic")
-        assert len(network.message_queue) > 0
+        assert network.message_queue.qsize() > 0
         
         # Test direct messaging
         peer_id = list(network.connected_peers.keys())[0]
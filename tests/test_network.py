@@ -2,7 +2,15 @@
 
 import pytest
 import asyncio
-from conductor.network import Libp2pNetwork, NetworkManager, PeerInfo
+import orjson
+from conductor.models import EncryptedShare, RBCPropose
+from conductor.network import Libp2pNetwork, NetworkManager, PeerInfo, current_topic, decode_message, encode_message
+
+
+async def _until(predicate):
+    """Yield to the event loop until predicate() is truthy."""
+    while not predicate():
+        await asyncio.sleep(0)
 
 
 class TestLibp2pNetwork:
@@ -44,6 +52,27 @@ class TestLibp2pNetwork:
         # All peers should be disconnected
         assert len(network.connected_peers) == 0
         
+    @pytest.mark.asyncio
+    async def test_stop_waits_for_running_handlers(self, network):
+        """stop() returns only after in-flight handlers have been cancelled."""
+        started = asyncio.Event()
+        finished = []
+
+        async def handler(message):
+            started.set()
+            try:
+                await asyncio.Event().wait()
+            finally:
+                finished.append(message)
+
+        await network.start()
+        await network.subscribe_topic("slow", handler)
+        await network.broadcast_message(b"m", "slow")
+        await started.wait()
+
+        await network.stop()
+        assert finished == [b"m"]
+
     @pytest.mark.asyncio
     async def test_broadcast_message(self, network):
         """Test message broadcasting."""
@@ -53,8 +82,52 @@ class TestLibp2pNetwork:
         await network.broadcast_message(message, "test_topic")
         
         # Check that message was queued
-        assert len(network.message_queue) > 0
+        assert network.message_queue.qsize() > 0
         
+    @pytest.mark.asyncio
+    async def test_broadcast_message_encodes_objects(self, network):
+        """Test that non-bytes messages are queued as JSON bytes."""
+        peer = PeerInfo(peer_id="peer1", address="addr", public_key=b"\x01\x02", last_seen=1.0)
+        await network.broadcast_message(peer, "test_topic")
+
+        queued = network.message_queue.get_nowait()
+        assert decode_message(queued["message"]) == {
+            "peer_id": "peer1",
+            "address": "addr",
+            "public_key": "0102",
+            "last_seen": 1.0,
+            "is_connected": False,
+        }
+        assert encode_message({"a": b"\xff"}) == b'{"a":"ff"}'
+
+    @pytest.mark.asyncio
+    async def test_peer_id_is_stable(self, network):
+        """Peer ids are a deterministic digest of the peer address."""
+        await network.start()
+
+        first = sorted(network.connected_peers)
+        other = Libp2pNetwork(listen_address="0.0.0.0:4002", bootstrap_peers=["peer1", "peer2"], node_id="other")
+        await other.start()
+
+        assert sorted(other.connected_peers) == first
+        assert all(len(peer_id) == len("peer_") + 16 for peer_id in first)
+        await network.stop()
+        await other.stop()
+
+    def test_rbc_propose_round_trip(self):
+        """RBCPropose travels as a binary frame with raw chunk bytes."""
+        proposal = RBCPropose(
+            epoch=7, proposer_id="v1", payload_hash=b"\xab" * 32,
+            enc_chunks=[EncryptedShare(share_id=i, data=bytes([i]) * 40) for i in range(4)],
+            k=2, n=4,
+        )
+        encoded = encode_message(proposal)
+
+        assert decode_message(encoded) == proposal
+        assert len(encoded) < len(orjson.dumps(proposal, default=lambda b: b.hex()))
+        with pytest.raises(ValueError):
+            decode_message(encoded + b"\x00")
+
     @pytest.mark.asyncio
     async def test_send_direct(self, network):
         """Test direct message sending."""
@@ -91,6 +164,41 @@ class TestLibp2pNetwork:
         assert "test_topic" in network.gossip_topics
         assert "test_topic" in network.message_handlers
         
+    @pytest.mark.asyncio
+    async def test_slow_handler_does_not_block_other_topics(self, network):
+        """Handlers for different topics run concurrently with their own topic context."""
+        await network.start()
+        release = asyncio.Event()
+        seen = []
+
+        async def slow_handler(message):
+            await release.wait()
+
+        async def fast_handler(message):
+            seen.append(current_topic.get())
+
+        await network.subscribe_topic("consensus", slow_handler)
+        await network.subscribe_topic("vdf_proofs", fast_handler)
+        await network.broadcast_message(b"slow", "consensus")
+        await network.broadcast_message(b"fast", "vdf_proofs")
+        await asyncio.wait_for(_until(lambda: seen), timeout=1)
+
+        assert seen == ["vdf_proofs"]
+        release.set()
+        await asyncio.wait_for(network.message_queue.join(), timeout=1)
+        await network.stop()
+
+    @pytest.mark.asyncio
+    async def test_disconnect_stale_peers(self, network):
+        """Test that only peers silent past the timeout are disconnected."""
+        await network.start()
+        stale_peer, live_peer = list(network.connected_peers)
+        network._set_last_seen(stale_peer, 0.0)
+        network.mark_peer_seen(live_peer)
+
+        assert await network.disconnect_stale_peers(timeout=60.0) == [stale_peer]
+        assert list(network.connected_peers) == [live_peer]
+
     @pytest.mark.asyncio
     async def test_request_fragment(self, network):
         """Test fragment request."""
@@ -188,7 +296,7 @@ class TestNetworkManager:
         await network_manager.broadcast_consensus_message(message)
         
         # Check that message was queued
-        assert len(network_manager.network.message_queue) > 0
+        assert network_manager.network.message_queue.qsize() > 0
         
     @pytest.mark.asyncio
     async def test_broadcast_vdf_proof(self, network_manager):
@@ -199,7 +307,7 @@ class TestNetworkManager:
         await network_manager.broadcast_vdf_proof(proof)
         
         # Check that message was queued
-        assert len(network_manager.network.message_queue) > 0
+        assert network_manager.network.message_queue.qsize() > 0
         
     @pytest.mark.asyncio
     async def test_send_direct_message(self, network_manager):
@@ -1,8 +1,10 @@
+import asyncio
 import pytest
 import os
 import shutil
-from src.conductor.conductor import ValidatorStorage
-from src.conductor.models import DayProof
+from dataclasses import astuple
+from src.conductor.node import PROOF_RECORD_VERSION, ValidatorStorage
+from src.conductor.models import DayProof, EncryptedShare, RBCPropose
 from src.conductor.vdf import GENESIS_SEED
 import nacl.signing
 
@@ -89,3 +91,100 @@ class TestValidatorStorage:
         assert retrieved_proof.computed_at == updated_proof.computed_at
         assert retrieved_proof.validator_id == new_validator_id
         assert retrieved_proof.signature == new_signature
+
+    @pytest.mark.asyncio
+    async def test_concurrent_block_saves_are_group_committed(self, validator_storage):
+        blocks = {epoch: {"block_digest": f"digest_{epoch}", "proposals": []} for epoch in range(20)}
+        await asyncio.gather(*(validator_storage.save_block(epoch, block) for epoch, block in blocks.items()))
+        await validator_storage.batcher.close()
+
+        for epoch, block in blocks.items():
+            assert await validator_storage.get_block(epoch) == block
+        assert await validator_storage.get_block(999) is None
+
+    @pytest.mark.asyncio
+    async def test_save_block_serializes_proposals_and_bytes(self, validator_storage):
+        proposal = RBCPropose(epoch=3, proposer_id="v1", payload_hash=b"\xab" * 32, enc_chunks=[EncryptedShare(share_id=0, data=b"\xab" * 32)], k=1, n=1)
+        await validator_storage.save_block(3, {"block_digest": "d", "proposals": [proposal], "common_coin": b"\x01\xff"})
+        await validator_storage.batcher.close()
+
+        stored = await validator_storage.get_block(3)
+        assert stored["proposals"] == [{
+            "epoch": 3, "proposer_id": "v1", "payload_hash": "ab" * 32,
+            "enc_chunks": [{"share_id": 0, "data": "ab" * 32}], "k": 1, "n": 1,
+        }]
+        assert stored["common_coin"] == "01ff"
+
+    @pytest.mark.asyncio
+    async def test_save_proofs_in_one_batch(self, validator_storage, sample_day_proof):
+        proofs = [
+            DayProof(day_number=day, proof=b"proof_%d" % day, validator_id=sample_day_proof.validator_id, signature=sample_day_proof.signature)
+            for day in range(5)
+        ]
+        await validator_storage.save_proofs(proofs)
+
+        for proof in proofs:
+            assert (await validator_storage.get_proof(proof.day_number)).proof == proof.proof
+
+    @pytest.mark.asyncio
+    async def test_flush_now_commits_pending_writes(self, validator_storage):
+        validator_storage.batcher.commit_interval = 60
+        save = asyncio.create_task(validator_storage.save_block(1, {"block_digest": "d"}))
+        await asyncio.sleep(0.01)
+        assert await validator_storage.get_block(1) is None
+
+        await validator_storage.flush_now()
+        await asyncio.wait_for(save, timeout=1)
+        assert await validator_storage.get_block(1) == {"block_digest": "d"}
+        await validator_storage.batcher.close()
+
+    @pytest.mark.asyncio
+    async def test_proof_round_trips_with_quorum_cert(self, validator_storage, sample_day_proof):
+        # node.py builds records from conductor.models, which is a distinct module
+        # from src.conductor.models, so compare against the same classes it returns
+        from conductor.models import DayProof as StoredDayProof, QuorumCertificate
+
+        proof = StoredDayProof(
+            day_number=2, proof=b"proof", validator_id=sample_day_proof.validator_id, signature=sample_day_proof.signature,
+            quorum_cert=QuorumCertificate(epoch_or_day=2, payload_hash="ab", signatures={"v1": "s1"}, aggregated_signature="agg"),
+        )
+        record = validator_storage._serialize(proof)
+
+        assert record[0] == PROOF_RECORD_VERSION
+        assert validator_storage._deserialize(record) == proof
+        assert astuple(validator_storage._deserialize(validator_storage._serialize(sample_day_proof))) == astuple(sample_day_proof)
+        with pytest.raises(ValueError):
+            validator_storage._deserialize(b"\x80" + record[1:])
+
+    @pytest.mark.asyncio
+    async def test_has_proof_survives_reopen(self, tmp_storage_path, sample_day_proof):
+        storage = ValidatorStorage(tmp_storage_path)
+        await storage.save_proof(sample_day_proof)
+        await storage.close()
+
+        reopened = ValidatorStorage(tmp_storage_path)
+        assert sample_day_proof.day_number not in reopened._known_days
+        assert await reopened.has_proof(sample_day_proof.day_number) is True
+        assert sample_day_proof.day_number in reopened._known_days
+        assert await reopened.has_proof(sample_day_proof.day_number + 1) is False
+        await reopened.close()
+
+    @pytest.mark.asyncio
+    async def test_close_flushes_and_releases_environment(self, tmp_storage_path):
+        storage = ValidatorStorage(tmp_storage_path)
+        storage.batcher.commit_interval = 60
+        save = asyncio.create_task(storage.save_block(1, {"block_digest": "d"}))
+        await asyncio.sleep(0.01)
+        await storage.close()
+        await asyncio.wait_for(save, timeout=1)
+
+        reopened = ValidatorStorage(tmp_storage_path)
+        assert await reopened.get_block(1) == {"block_digest": "d"}
+        await reopened.close()
+
+    @pytest.mark.asyncio
+    async def test_get_proof_is_served_from_cache(self, validator_storage, sample_day_proof):
+        await validator_storage.save_proof(sample_day_proof)
+        validator_storage._deserialize = None  # Any LMDB read would now fail
+
+        assert await validator_storage.get_proof(sample_day_proof.day_number) is sample_day_proof
@@ -4,7 +4,7 @@ from unittest.mock import AsyncMock, MagicMock, patch, ANY
 from datetime import datetime, timezone, timedelta
 
 from src.conductor.node import (
-    ValidatorNode, DayProof, ValidatorStorage, DHTNetwork, ConsensusModule, ConsensusError,
+    ValidatorNode, DayProof, ValidatorStorage, DHTNetwork, PeerRegistry, ConsensusModule, ConsensusError,
     GENESIS_SEED, SECONDS_PER_DAY, GENESIS_TIMESTAMP, VDF_ITERATIONS_PER_DAY, logger
 )
 from src.conductor.vdf import ChorusVDF, VDF_TEST_ITERATIONS
@@ -198,6 +198,33 @@ class TestDHTNetwork:
         proofs = await dht.collect_peer_proofs(1)
         assert proofs == []
 
+    @pytest.mark.asyncio
+    async def test_peer_fan_out_survives_failing_peer(self, mock_bootstrap_peers):
+        registry = PeerRegistry()
+        nodes = [DHTNetwork(mock_bootstrap_peers, (b"\x00" * 32, bytes([i]) * 32), registry=registry) for i in range(3)]
+        nodes[1].handle_published_proof = AsyncMock(side_effect=RuntimeError("peer down"))
+        proof = DayProof(1, b"proof1", nodes[0].keypair[1], b"sig1")
+
+        await nodes[0].publish_proof(proof)
+
+        assert await nodes[2].get_proof_for_day(1) == {proof.validator_id: proof}
+        collected = await nodes[2].collect_peer_proofs(1, DayProof(1, b"proof2", nodes[2].keypair[1], b"sig2"))
+        assert {p.validator_id for p in collected} == {nodes[0].keypair[1], nodes[2].keypair[1]}
+
+    @pytest.mark.asyncio
+    async def test_proof_day_table_keeps_columns_aligned(self, mock_validator_keypair, mock_bootstrap_peers):
+        dht = DHTNetwork(mock_bootstrap_peers, mock_validator_keypair)
+        ids = [bytes([i]) * 32 for i in (3, 1, 2)]
+        await dht.handle_vdf_completion_time(1, ids[0], 30.0)
+        for validator_id in ids:
+            await dht.handle_published_proof(DayProof(1, b"proof", validator_id, b"sig"))
+        await dht.handle_vdf_completion_time(1, ids[1], 10.0)
+
+        assert list(await dht.get_proof_for_day(1)) == sorted(ids)
+        assert dht.completion_times(1) == [10.0, 30.0]
+        assert dht.completion_times(2) == []
+        assert await dht.get_proof_for_day(2) == {}
+
 class TestConsensusModule:
     @pytest.fixture
     def consensus_module(mock_config):
@@ -239,3 +266,33 @@ class TestConsensusModule:
         # Total validators = 3. Each has 1/3 of votes, not enough for 0.67
         with pytest.raises(ConsensusError, match="No consensus"): 
             await consensus_module.reach_consensus(1, our_proof, mock_dht_network)
+
+
+@pytest.mark.asyncio
+async def test_blacklist_vote_with_shared_validator_list():
+    from src.conductor.config import Config
+    from src.conductor.models import BlacklistVote
+
+    validator_ids = ["a", "b", "c", "d"]
+    modules = [ConsensusModule(Config(), validator_id, validator_ids) for validator_id in validator_ids[:2]]
+    for module in modules:
+        for voter in "abc":
+            await module.handle_blacklist_vote(BlacklistVote(epoch=0, voter_id=voter, target_validator_id="d", reason="test"))
+
+    assert validator_ids == ["a", "b", "c", "d"]
+    assert all(module.validators == ["a", "b", "c"] for module in modules)
+
+
+@pytest.mark.asyncio
+async def test_enc_share_with_out_of_range_index_is_dropped():
+    from src.conductor.config import Config
+    from src.conductor.models import EncShare, EncryptedShare
+
+    module = ConsensusModule(Config(), "a", ["a", "b", "c", "d"])
+    for index in (-1, 4, 10**9):
+        await module.handle_enc_share(EncShare(epoch=0, enc_payload_share=EncryptedShare(share_id=index, data=b"x"), proposer_id="b", chunk_index=index))
+    assert module.received_enc_chunks.get((0, "b")) is None
+
+    share = EncryptedShare(share_id=2, data=b"x")
+    await module.handle_enc_share(EncShare(epoch=0, enc_payload_share=share, proposer_id="b", chunk_index=2))
+    assert module.received_enc_chunks[(0, "b")] == [None, None, share, None]